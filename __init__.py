@@ -1,8 +1,13 @@
 import asyncio
+import io
+import re
 import time
+from pathlib import Path
 
+import aiohttp
+from aiohttp import web
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 import breadcord
 from breadcord.module import ModuleCog
@@ -10,23 +15,178 @@ from .helpers import *
 
 load_time: datetime = datetime.now()
 
+USER_ID_PATTERN = re.compile(r"\d{15,20}")
+BULK_WHOIS_LIMIT = 1000
+BULK_WHOIS_BATCH_SIZE = 100
+
 class Thermometer(ModuleCog):
     def __init__(self, module_id: str):
         super().__init__(module_id)
-        
+
+        asset_cache.max_bytes = self.settings.asset_cache_max_bytes.value
+        asset_cache.ttl = self.settings.asset_cache_ttl.value
+        if self.settings.disk_cache_enabled.value:
+            asset_store.configure(self.module.storage_path / "assets", self.settings.disk_cache_max_bytes.value)
+        self.profile_cache = ProfileCache(max_age=self.settings.profile_cache_max_age.value)
+        guild_stats.approximate_counts_max_age = self.settings.approximate_counts_max_age.value
+        metrics.enabled = self.settings.metrics_enabled.value
+        metrics.add_collector("asset_cache", asset_cache.stats)
+        metrics.add_collector("disk_asset_store", asset_store.stats)
+        metrics.add_collector("profile_cache", self.profile_cache.stats)
+        metrics.add_collector("single_flight", single_flight.stats)
+        self.metrics_runner: web.AppRunner | None = None
+        self.session: aiohttp.ClientSession | None = None
+        self.health = HealthMonitor(
+            lambda: self.bot.latency,
+            interval=self.settings.health_sample_interval.value,
+            history=round(self.settings.health_history_minutes.value * 60 / self.settings.health_sample_interval.value),
+            block_threshold=self.settings.health_block_threshold_ms.value / 1000,
+            logger=self.logger,
+        )
+        offloader.threshold = self.settings.offload_threshold.value
+
         self.ctx_menu = app_commands.ContextMenu(
             name="Who got mentioned",
             callback=self.role_mention_members_ctx_menu,
         )
         self.bot.tree.add_command(self.ctx_menu)
 
+    async def cog_load(self) -> None:
+        self.session = aiohttp.ClientSession()
+        self.health.start()
+        if not metrics.enabled:
+            return
+        if port := self.settings.metrics_port.value:
+            app = web.Application()
+            app.router.add_get("/metrics", self.serve_metrics)
+            self.metrics_runner = web.AppRunner(app)
+            await self.metrics_runner.setup()
+            await web.TCPSite(self.metrics_runner, "127.0.0.1", port).start()
+        if self.settings.metrics_file.value:
+            self.export_metrics.start()
+
+    async def cog_unload(self) -> None:
+        self.health.stop()
+        if self.session:
+            await self.session.close()
+        self.export_metrics.cancel()
+        await route_scheduler.close()
+        offloader.shutdown()
+        if self.metrics_runner:
+            await self.metrics_runner.cleanup()
+
+    async def cog_before_invoke(self, ctx: commands.Context) -> None:
+        ctx.command_started_at = time.perf_counter()
+        self.health.command_started(id(ctx), ctx.command.qualified_name)
+
+    async def cog_after_invoke(self, ctx: commands.Context) -> None:
+        self.health.command_finished(id(ctx))
+        if started_at := getattr(ctx, "command_started_at", None):
+            metrics.observe(ctx.command.qualified_name, "total", time.perf_counter() - started_at)
+        # Not counted in cog_command_error, defining it would stop the bot's default error handler from logging
+        if ctx.command_failed:
+            metrics.record_error(ctx.command.qualified_name, "total")
+
+    async def serve_metrics(self, _: web.Request) -> web.Response:
+        return web.Response(text=metrics.render_prometheus(), content_type="text/plain")
+
+    @tasks.loop(seconds=60)
+    async def export_metrics(self) -> None:
+        path = Path(self.settings.metrics_file.value)
+        await asyncio.to_thread(path.write_text, metrics.render_prometheus())
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        guild_stats.member_joined(member)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        guild_stats.channel_created(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        guild_stats.channel_deleted(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel) -> None:
+        guild_stats.channel_updated(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        guild_stats.forget(guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, _: discord.Member, after: discord.Member) -> None:
+        self.profile_cache.invalidate(after.guild.id, after.id)
+
+    @commands.Cog.listener()
+    async def on_presence_update(self, _: discord.Member, after: discord.Member) -> None:
+        self.profile_cache.invalidate(after.guild.id, after.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        self.profile_cache.invalidate(member.guild.id, member.id)
+        guild_stats.member_left(member)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, _: discord.User, after: discord.User) -> None:
+        self.profile_cache.invalidate_user(after.id)
+
+    async def fetch_profile(
+        self,
+        guild: discord.Guild | None,
+        user: discord.User | discord.Member,
+    ) -> discord.User | discord.Member:
+        """Gets a complete saturated user or member object (including banners), reusing recently fetched ones."""
+        guild_id = guild.id if guild and guild.get_member(user.id) else None
+        if (cached := self.profile_cache.get(guild_id, user.id)) is not None:
+            return cached
+
+        profile: discord.User | discord.Member
+        if guild_id is not None:
+            profile = await single_flight.run(("member", guild_id, user.id), lambda: guild.fetch_member(user.id))
+        else:
+            profile = await single_flight.run(("user", user.id), lambda: self.bot.fetch_user(user.id))
+        self.profile_cache.put(guild_id, user.id, profile)
+        return profile
+
+    @commands.hybrid_group(name="thermometer", description="Thermometer module internals")
+    @commands.is_owner()
+    async def thermometer_group(self, ctx: commands.Context) -> None:
+        await ctx.send_help(ctx.command)
+
+    @thermometer_group.command(name="metrics", description="Get the module's command metrics.")
+    @commands.is_owner()
+    async def thermometer_metrics(self, ctx: commands.Context) -> None:
+        if not metrics.enabled:
+            await ctx.reply("Metrics are disabled, enable them with the `metrics_enabled` setting.", ephemeral=True)
+            return
+        await ctx.reply(
+            file=discord.File(BytesIO(metrics.render_prometheus().encode()), filename="metrics.txt"),
+            ephemeral=True,
+        )
+
     @commands.hybrid_command(description="Returns how long the bot has been running.")
-    async def uptime(self, ctx: commands.Context) -> None:
+    async def uptime(self, ctx: commands.Context, detailed: bool = False) -> None:
         # This is technically wrong, as it's the cog uptime, not necessarily the bot uptime, but eh
         global load_time
         uptime = datetime.now() - load_time
         started_timestamp = round(time.mktime(load_time.timetuple()))
-        await ctx.reply(f"Bot has been online for {readable_timedelta(uptime)}, last started <t:{started_timestamp}>")
+        await ctx.reply(
+            f"Bot has been online for {readable_timedelta(uptime)}, last started <t:{started_timestamp}>",
+            embeds=self.health_embeds(5) if detailed else [],
+        )
+
+    @commands.hybrid_command(description="Returns how healthy the bot's event loop has been recently.")
+    async def health(self, ctx: commands.Context, minutes: commands.Range[int, 1, 1440] = 5) -> None:
+        await ctx.reply(embeds=self.health_embeds(minutes))
+
+    def health_embeds(self, minutes: int) -> list[discord.Embed]:
+        return build_info_embeds(
+            self.health.summary(minutes * 60),
+            title=f"Health over the last {minutes} minutes",
+            inline_fields=True,
+        )
 
     @commands.hybrid_command(aliases=["pfp"], description="Gets a user's profile picture.")
     async def avatar(
@@ -52,47 +212,168 @@ class Thermometer(ModuleCog):
             allowed_mentions=discord.AllowedMentions.none(),
         )
 
-    @commands.hybrid_command(description="Gets info about a user.")
+    @commands.hybrid_group(description="Gets info about a user.", fallback="user", invoke_without_command=True)
     async def whois(self, ctx: commands.Context, user: discord.User | None = None) -> None:
-        target: discord.User | discord.Member = user or ctx.author
-        # Ensure we have complete saturated objects
-        if ctx.guild and target in ctx.guild.members:
-            target = await ctx.guild.fetch_member(target.id)
-        else:
-            target = await self.bot.fetch_user(target.id)
-
-        user_details: dict[str, Any | None] = await WhoisHelper.get_user_details(target)
-        if isinstance(target, discord.Member):
-            user_details |= await WhoisHelper.get_member_details(target)
-
-        target_info_embed: discord.Embed = build_info_embed(
-            user_details,
-            title="User info" if user is not None else "Own user info",
-            colour=target.colour,
-            thumbnail=max_size(target.avatar if target.avatar else target.default_avatar).url,
-            image=max_size(target.banner).url if target.banner else None,
+        requested: discord.User | discord.Member = user or ctx.author
+        started_at = time.perf_counter()
+        # Both files have to fit into one message, so each gets half of the upload limit
+        max_asset_bytes = (ctx.guild.filesize_limit if ctx.guild else DEFAULT_FILESIZE_LIMIT) // 2
+        # The avatar is usually known before the profile is fetched, so start downloading it right away
+        avatar_task = asyncio.create_task(
+            fetch_asset(requested.avatar, "avatar", session=self.session, max_bytes=max_asset_bytes)
         )
-        embeds: list[discord.Embed] = [target_info_embed]
-        if isinstance(target, discord.Member):
-            embeds.extend(await WhoisHelper.get_member_activity_embeds(target))
-            
-        response: discord.Message = await ctx.reply(embeds=embeds)
+
+        try:
+            with metrics.phase("whois", "fetch"):
+                target: discord.User | discord.Member = await self.fetch_profile(ctx.guild, requested)
+
+            with metrics.phase("whois", "helpers"):
+                user_details: dict[str, Any | None] = await WhoisHelper.get_user_details(target)
+                if isinstance(target, discord.Member):
+                    user_details |= await WhoisHelper.get_member_details(target)
+
+                activity_embeds: list[discord.Embed] = []
+                if isinstance(target, discord.Member):
+                    activity_embeds = (await WhoisHelper.get_member_activity_embeds(target))[:MESSAGE_EMBED_COUNT_LIMIT - 1]
+
+                embeds: list[discord.Embed] = build_info_embeds(
+                    user_details,
+                    title="User info" if user is not None else "Own user info",
+                    colour=target.colour,
+                    thumbnail=max_size(target.avatar if target.avatar else target.default_avatar).url,
+                    image=max_size(target.banner).url if target.banner else None,
+                    budget=MESSAGE_EMBEDS_LIMIT - sum(map(len, activity_embeds)),
+                    max_embeds=MESSAGE_EMBED_COUNT_LIMIT - len(activity_embeds),
+                ) + activity_embeds
+                target_info_embed = embeds[0]
+        except BaseException:
+            # Nothing is going to wait for the avatar anymore
+            discard_asset(avatar_task)
+            raise
+
         if target.avatar is None and target.banner is None:
+            discard_asset(avatar_task)
+            with metrics.phase("whois", "reply"):
+                async with route_scheduler.interactive(ctx.channel.id):
+                    await ctx.reply(embeds=embeds)
             return
-        
-        avatar_file, banner_file = await asyncio.gather(
-            fetch_asset(target.avatar, "avatar"), 
-            fetch_asset(target.banner, "banner"), 
+
+        if target.avatar != requested.avatar:
+            discard_asset(avatar_task)
+            avatar_task = asyncio.create_task(
+                fetch_asset(target.avatar, "avatar", session=self.session, max_bytes=max_asset_bytes)
+            )
+        banner_task = asyncio.create_task(
+            fetch_asset(target.banner, "banner", session=self.session, max_bytes=max_asset_bytes)
         )
-        if avatar_file:
-            target_info_embed.set_thumbnail(url=f"attachment://{avatar_file.filename}")
-        if banner_file:
-            target_info_embed.set_image(url=f"attachment://{banner_file.filename}")
-        await response.edit(
-            embeds=embeds,
-            attachments=[file for file in (avatar_file, banner_file) if file is not None]
+
+        remaining = self.settings.whois_asset_deadline.value - (time.perf_counter() - started_at)
+        if remaining > 0:
+            with metrics.phase("whois", "assets"):
+                done, _ = await asyncio.wait((avatar_task, banner_task), timeout=remaining)
+            if len(done) == 2:
+                metrics.increment("whois_single_message")
+                with metrics.phase("whois", "reply"):
+                    async with route_scheduler.interactive(ctx.channel.id):
+                        await ctx.reply(
+                            embeds=embeds,
+                            files=attach_assets(target_info_embed, avatar_task.result(), banner_task.result()),
+                        )
+                return
+
+        metrics.increment("whois_reply_then_edit")
+        try:
+            with metrics.phase("whois", "reply"):
+                async with route_scheduler.interactive(ctx.channel.id):
+                    response: discord.Message = await ctx.reply(embeds=embeds)
+            with metrics.phase("whois", "assets"):
+                avatar_file, banner_file = await asyncio.gather(avatar_task, banner_task)
+            with metrics.phase("whois", "edit"):
+                # Adding the attachments isn't urgent, so it gives way to replies in the same channel
+                await route_scheduler.follow_up(ctx.channel.id, lambda: response.edit(
+                    embeds=embeds,
+                    attachments=attach_assets(target_info_embed, avatar_file, banner_file),
+                ))
+        finally:
+            # The files are closed once sent, this closes them when the reply or the edit never happened
+            discard_asset(avatar_task)
+            discard_asset(banner_task)
+
+    @whois.command(name="bulk", description="Gets short info about several users at once.")
+    @commands.guild_only()
+    async def whois_bulk(self, ctx: commands.Context, *, users: str) -> None:
+        if not ctx.guild:
+            await ctx.reply("This command can only be used in a guild.")
+            return
+        # Querying the gateway for members that aren't cached can take a while
+        await ctx.defer()
+        user_ids = list(dict.fromkeys(int(user_id) for user_id in USER_ID_PATTERN.findall(users)))
+        with metrics.phase("whois bulk", "fetch"):
+            members, unresolved = await WhoisHelper.resolve_members(ctx.guild, user_ids[:BULK_WHOIS_LIMIT])
+        await self.send_member_summaries(
+            ctx,
+            members,
+            title="User info",
+            note=f"**Not found:** {truncate(', '.join(map(str, unresolved)), 1000)}\n" if unresolved else "",
         )
 
+    @whois.command(name="role", description="Gets short info about every member with a role.")
+    @commands.guild_only()
+    async def whois_role(self, ctx: commands.Context, role: discord.Role) -> None:
+        if not ctx.guild:
+            await ctx.reply("This command can only be used in a guild.")
+            return
+        await ctx.defer()
+        complete = await self.ensure_chunked(ctx.guild)
+        guild_members = ctx.guild.members
+        if role.is_default():
+            members = guild_members
+        else:
+            with metrics.phase("whois role", "fetch"):
+                members = (await offloader.run(
+                    len(guild_members),
+                    GuildInfoHelper.get_role_members,
+                    guild_members,
+                    [role],
+                ))[role]
+        await self.send_member_summaries(
+            ctx,
+            members,
+            title=f'Members with the role "{role.name}"',
+            note="" if complete else "**Note:** The member list isn't fully cached, members may be missing.\n",
+        )
+
+    async def send_member_summaries(
+        self,
+        ctx: commands.Context,
+        members: list[discord.Member],
+        *,
+        title: str,
+        note: str = "",
+    ) -> None:
+        if not members:
+            await ctx.reply(f"No members found.\n{note}")
+            return
+
+        shown = members[:BULK_WHOIS_LIMIT]
+        summaries: list[str] = []
+        with metrics.phase("whois bulk", "helpers"):
+            for start in range(0, len(shown), BULK_WHOIS_BATCH_SIZE):
+                summaries += [
+                    await WhoisHelper.get_member_summary(member)
+                    for member in shown[start:start + BULK_WHOIS_BATCH_SIZE]
+                ]
+                await asyncio.sleep(0)  # Let other tasks run between batches
+        await PaginatedView(
+            summaries,
+            title=title,
+            header=f"**Member count:** {len(members)}"
+            + (f" (showing {BULK_WHOIS_LIMIT})" if len(members) > BULK_WHOIS_LIMIT else "")
+            + f"\n{note}\n",
+            page_size=10,
+            author_id=ctx.author.id,
+        ).send(ctx)
+
     @commands.hybrid_group(name="guild", description="Various guild related info")
     @commands.guild_only()
     async def guild_info_group(self, ctx: commands.Context) -> None:
@@ -104,68 +385,173 @@ class Thermometer(ModuleCog):
         if not ctx.guild:
             await ctx.reply("This command can only be used in a guild.")
             return
-        channels = [
-            channel.mention
-            for channel in ctx.guild.channels
-            if not isinstance(channel, discord.CategoryChannel)
-        ]
-        await ctx.reply(embed=discord.Embed(
+        channels = [channel for channel in ctx.guild.channels if not isinstance(channel, discord.CategoryChannel)]
+        await PaginatedView(
+            channels,
             title="Guild channels",
-            description=f"**Channel count:** {len(channels)}\n\n" + "\n".join(channels)
-        ))
+            header=f"**Channel count:** {len(channels)}\n\n",
+            formatter=lambda channel: channel.mention,
+            page_size=50,
+            author_id=ctx.author.id,
+        ).send(ctx)
 
     @guild_info_group.command(name="emojis", description="Get the guilds emojis.")
     async def guild_emojis(self, ctx: commands.Context) -> None:
         if not ctx.guild:
             await ctx.reply("This command can only be used in a guild.")
             return
-        await ctx.reply(embed=discord.Embed(
+        await PaginatedView(
+            ctx.guild.emojis,
             title="Guild emojis",
-            description=f"**Emoji count:** {len(ctx.guild.emojis)}\n\n" + "".join(map(str, ctx.guild.emojis))
-        ))
+            header=f"**Emoji count:** {len(ctx.guild.emojis)}\n\n",
+            separator="",
+            page_size=50,
+            author_id=ctx.author.id,
+        ).send(ctx)
 
     @guild_info_group.command(name="members", description="Get the guilds members.")
     async def guild_members(self, ctx: commands.Context) -> None:
         if not ctx.guild:
             await ctx.reply("This command can only be used in a guild.")
             return
-        members = sorted(ctx.guild.members, key=lambda x: x.name)
-        await ctx.reply(embed=discord.Embed(
+        snapshot = ctx.guild.members
+        with metrics.phase("guild members", "sort"):
+            members = await offloader.run(len(snapshot), lambda: sorted(snapshot, key=lambda x: x.name))
+        await PaginatedView(
+            members,
             title="Guild members",
-            description=f"**Member count:** {len(members)}\n\n" + ", ".join([member.mention for member in members]),
-        ))
+            header=f"**Member count:** {len(members)}\n\n",
+            formatter=lambda member: member.mention,
+            separator=", ",
+            page_size=100,
+            author_id=ctx.author.id,
+        ).send(ctx)
+
+    @guild_info_group.command(name="export", description="Exports the guild's members, channels, roles or emojis as a file.")
+    @commands.has_guild_permissions(manage_guild=True)
+    @commands.cooldown(1, 300, commands.BucketType.guild)
+    async def guild_export(
+        self,
+        ctx: commands.Context,
+        kind: ExportKind = "members",
+        file_format: ExportFormat = "csv",
+        compress: bool = False,
+    ) -> None:
+        if not ctx.guild:
+            await ctx.reply("This command can only be used in a guild.")
+            return
+        await ctx.defer()
+        if kind == "members" and not await self.ensure_chunked(ctx.guild):
+            ctx.command.reset_cooldown(ctx)
+            await ctx.reply("This guild's member list isn't fully cached, so a member export would be incomplete.")
+            return
+        items = export_sources(ctx.guild, kind)
+        with metrics.phase("guild export", "write"):
+            file = await offloader.run(
+                len(items),
+                lambda: write_export(
+                    export_rows(kind, items),
+                    EXPORT_COLUMNS[kind],
+                    file_format=file_format,
+                    compress=compress,
+                ),
+            )
+        size = file.seek(0, io.SEEK_END)
+        file.seek(0)
+        if size > ctx.guild.filesize_limit:
+            file.close()
+            ctx.command.reset_cooldown(ctx)  # So the suggested retry isn't blocked
+            limit, unit = convert_bytes(ctx.guild.filesize_limit)
+            await ctx.reply(
+                f"The export is larger than this guild's upload limit of {round(limit)} {unit}"
+                + (", try compressing it." if not compress else ".")
+            )
+            return
+        filename = f"{ctx.guild.id}-{kind}.{file_format}" + (".gz" if compress else "")
+        try:
+            with metrics.phase("guild export", "upload"):
+                await ctx.reply(f"Exported {len(items)} {kind}.", file=discord.File(file, filename=filename))
+        finally:
+            file.close()
 
     @guild_info_group.command(name="info", description="Gets general info about the guild.")
     async def guild_info(self, ctx: commands.Context) -> None:
         if not ctx.guild:
             await ctx.reply("This command can only be used in a guild.")
             return
-        await ctx.reply(embed=build_info_embed(
-            await GuildInfoHelper.get_guild_info(ctx.guild),
-            title="Guild info",
-            thumbnail=max_size(ctx.guild.icon).url if ctx.guild.icon else None,
-            image=max_size(ctx.guild.banner).url if ctx.guild.banner else None,
-            inline_fields=False,
-        ))
+        approximate_counts: ApproximateCounts | None = None
+        if not ctx.guild.chunked:
+            # Chunking the guild or fetching its counts can take longer than an interaction may go unanswered
+            await ctx.defer()
+            with metrics.phase("guild info", "fetch"):
+                approximate_counts = await self.fetch_member_counts(ctx.guild)
+        with metrics.phase("guild info", "helpers"):
+            embeds = build_info_embeds(
+                await GuildInfoHelper.get_guild_info(ctx.guild, approximate_counts),
+                title="Guild info",
+                thumbnail=max_size(ctx.guild.icon).url if ctx.guild.icon else None,
+                image=max_size(ctx.guild.banner).url if ctx.guild.banner else None,
+                inline_fields=False,
+            )
+        with metrics.phase("guild info", "reply"):
+            await ctx.reply(embeds=embeds)
+
+    async def fetch_member_counts(self, guild: discord.Guild) -> ApproximateCounts | None:
+        """
+        Makes sure member counts are available for a guild whose member list isn't fully cached.
+
+        :return: Approximate counts to use instead of the member cache, or None if the guild got chunked.
+        """
+        if await self.ensure_chunked(guild):
+            return None
+        return await guild_stats.approximate_counts(self.bot, guild)
+
+    async def ensure_chunked(self, guild: discord.Guild) -> bool:
+        """
+        Requests the member list of a guild that hasn't been chunked, if the chunk_guilds_on_demand setting allows it.
+
+        :return: Whether the guild's member list is complete.
+        """
+        if guild.chunked:
+            return True
+        if not self.settings.chunk_guilds_on_demand.value:
+            return False
+        try:
+            await guild_stats.chunk(guild)
+        except discord.ClientException:  # The members intent is disabled
+            return False
+        return True
 
     async def role_mention_members_ctx_menu(self, interaction: discord.Interaction, message: discord.Message) -> None:
+        self.health.command_started(id(interaction), "Who got mentioned")
+        try:
+            with metrics.phase("Who got mentioned", "total"):
+                await self._role_mention_members(interaction, message)
+        finally:
+            self.health.command_finished(id(interaction))
+
+    async def _role_mention_members(self, interaction: discord.Interaction, message: discord.Message) -> None:
         if not message.role_mentions:
             await interaction.response.send_message("No role mentions found.", ephemeral=True)
             return
-        await interaction.response.send_message(
-            f"Only showing 10 of the {len(message.role_mentions)} role mentions."
-            if len(message.role_mentions) > 10 else "",
-            embeds=[
-                discord.Embed(
-                    title=f'Members with the role "{role.name}" ' + ("(top 25)" if len(role.members) > 25 else ""),
-                    description=", ".join([member.mention for member in role.members[:25]]),
-                    colour=role.colour,
-                )
-                for role in message.role_mentions
-                if role.members
-            ][:10],
-            ephemeral=True,
-        )
+        if not message.guild:
+            await interaction.response.send_message("Role members can only be found in a guild.", ephemeral=True)
+            return
+        guild_members = message.guild.members
+        role_members = {
+            role: members
+            for role, members in (await offloader.run(
+                len(guild_members),
+                GuildInfoHelper.get_role_members,
+                guild_members,
+                message.role_mentions,
+            )).items()
+            if members
+        }
+        if not role_members:
+            await interaction.response.send_message("None of the mentioned roles have any members.", ephemeral=True)
+            return
+        await RoleMembersView(role_members, author_id=interaction.user.id).send_response(interaction, ephemeral=True)
 
 
 async def setup(bot: breadcord.Bot, module: breadcord.module.Module) -> None:
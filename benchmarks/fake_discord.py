@@ -0,0 +1,270 @@
+"""A local stand-in for the parts of the Discord REST API and CDN that the Thermometer cog uses."""
+import asyncio
+import hashlib
+import itertools
+import json
+import random
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from aiohttp import web
+
+API_PREFIX = "/api/v10"
+# Requests per second every route allows, generous enough that only the injected 429s slow requests down
+RATE_LIMIT = 1000
+TIMESTAMP = datetime(2020, 1, 1, tzinfo=timezone.utc).isoformat()
+
+
+def json_response(data: Any, *, status: int = 200, headers: dict[str, str] | None = None) -> web.Response:
+    # discord.py only parses bodies whose Content-Type is exactly application/json, without aiohttp's charset
+    return web.Response(
+        body=json.dumps(data).encode(),
+        status=status,
+        headers={"Content-Type": "application/json", **(headers or {})},
+    )
+
+
+def user_payload(user_id: int, *, bot: bool = False) -> dict[str, Any]:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id}",
+        "global_name": f"User {user_id}",
+        "discriminator": "0",
+        "avatar": f"{user_id:032x}",
+        # Every third user has an animated banner, the rest none
+        "banner": f"a_{user_id:030x}" if user_id % 3 == 0 else None,
+        "accent_color": None,
+        "public_flags": 0,
+        "bot": bot,
+    }
+
+
+def member_payload(user_id: int, role_ids: list[int]) -> dict[str, Any]:
+    return {
+        "user": user_payload(user_id, bot=user_id % 50 == 0),
+        "roles": [str(role_id) for role_id in role_ids],
+        "joined_at": TIMESTAMP,
+        "nick": None,
+        "avatar": None,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+        "pending": False,
+        "communication_disabled_until": None,
+    }
+
+
+def role_payload(role_id: int, position: int) -> dict[str, Any]:
+    return {
+        "id": str(role_id),
+        "name": f"role-{role_id}" if position else "@everyone",
+        "color": role_id % 0xFFFFFF,
+        "hoist": False,
+        "position": position,
+        "permissions": "0",
+        "managed": False,
+        "mentionable": True,
+        "flags": 0,
+    }
+
+
+def channel_payload(channel_id: int, guild_id: int, position: int) -> dict[str, Any]:
+    return {
+        "id": str(channel_id),
+        "guild_id": str(guild_id),
+        "name": f"channel-{channel_id}",
+        "type": 0,
+        "position": position,
+        "permission_overwrites": [],
+        "parent_id": None,
+        "topic": None,
+        "nsfw": False,
+        "rate_limit_per_user": 0,
+        "last_message_id": None,
+    }
+
+
+class FakeGuild:
+    """The data of a synthetic guild, shared by the server and the driver."""
+
+    def __init__(self, *, guild_id: int = 1, members: int, channels: int, roles: int, seed: int = 0) -> None:
+        rng = random.Random(seed)
+        self.id = guild_id
+        self.role_ids = [guild_id] + [10**4 + index for index in range(roles)]
+        self.channel_ids = [10**5 + index for index in range(channels)]
+        self.members = {
+            user_id: member_payload(user_id, rng.sample(self.role_ids[1:], k=min(roles, rng.randrange(1, 6))))
+            for user_id in range(10**6, 10**6 + members)
+        }
+
+    def payload(self, *, with_members: bool = True) -> dict[str, Any]:
+        return {
+            "id": str(self.id),
+            "name": "Load test guild",
+            "icon": None,
+            "splash": None,
+            "discovery_splash": None,
+            "banner": None,
+            "description": None,
+            "owner_id": str(next(iter(self.members))),
+            "features": [],
+            "verification_level": 1,
+            "default_message_notifications": 1,
+            "explicit_content_filter": 0,
+            "mfa_level": 0,
+            "nsfw_level": 0,
+            "premium_tier": 0,
+            "premium_subscription_count": 0,
+            "preferred_locale": "en-US",
+            "afk_timeout": 300,
+            "system_channel_flags": 0,
+            "max_members": 500_000,
+            "member_count": len(self.members),
+            "approximate_member_count": len(self.members),
+            "approximate_presence_count": len(self.members) // 4,
+            "roles": [role_payload(role_id, position) for position, role_id in enumerate(self.role_ids)],
+            "emojis": [],
+            "stickers": [],
+            "channels": [
+                channel_payload(channel_id, self.id, position)
+                for position, channel_id in enumerate(self.channel_ids)
+            ],
+            "members": list(self.members.values()) if with_members else [],
+            "threads": [],
+            "stage_instances": [],
+            "voice_states": [],
+            "presences": [],
+            "large": True,
+        }
+
+
+class FakeDiscord:
+    """
+    aiohttp application serving fake REST and CDN responses.
+
+    Every request waits for the configured latency, and a configurable share of REST requests is answered
+    with a 429, which discord.py handles by waiting for retry_after and trying again.
+    REST responses carry rate limit headers like Discord's, without them discord.py assumes a limit of one
+    request at a time per route.
+    """
+
+    def __init__(
+        self,
+        guild: FakeGuild,
+        *,
+        latency: float = 0.05,
+        cdn_latency: float = 0.02,
+        rate_limit_chance: float = 0.0,
+        asset_bytes: int = 256 * 1024,
+        seed: int = 0,
+    ) -> None:
+        self.guild = guild
+        self.latency = latency
+        self.cdn_latency = cdn_latency
+        self.rate_limit_chance = rate_limit_chance
+        self.asset = random.Random(seed).randbytes(asset_bytes)
+        self.requests: Counter[str] = Counter()
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+        self._message_ids = itertools.count(10**9)
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_get(f"{API_PREFIX}/users/@me", self.get_self)
+        self.app.router.add_get(f"{API_PREFIX}/users/{{user_id}}", self.get_user)
+        self.app.router.add_get(f"{API_PREFIX}/guilds/{{guild_id}}", self.get_guild)
+        self.app.router.add_get(f"{API_PREFIX}/guilds/{{guild_id}}/members/{{user_id}}", self.get_member)
+        self.app.router.add_post(f"{API_PREFIX}/channels/{{channel_id}}/messages", self.send_message)
+        self.app.router.add_patch(f"{API_PREFIX}/channels/{{channel_id}}/messages/{{message_id}}", self.edit_message)
+        self.app.router.add_get("/{kind:avatars|banners|icons}/{owner_id}/{filename}", self.get_asset)
+        self._runner: web.AppRunner | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}"
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        resource = request.match_info.route.resource
+        route = f"{request.method} {resource.canonical if resource else request.path}"
+        self.requests[route] += 1
+        is_cdn = not request.path.startswith(API_PREFIX)
+        await asyncio.sleep(self.cdn_latency if is_cdn else self.latency)
+        if not is_cdn and self._rng.random() < self.rate_limit_chance:
+            self.rate_limited += 1
+            return json_response(
+                {"message": "You are being rate limited.", "retry_after": 0.05, "global": False},
+                status=429,
+                # discord.py treats 429s without a Via header as Cloudflare bans
+                headers={"X-RateLimit-Scope": "user", "Via": "1.1 google"},
+            )
+        response = await handler(request)
+        if not is_cdn:
+            response.headers.update({
+                "X-RateLimit-Limit": str(RATE_LIMIT),
+                "X-RateLimit-Remaining": str(RATE_LIMIT - 1),
+                "X-RateLimit-Reset-After": "1",
+                "X-RateLimit-Bucket": hashlib.sha1(route.encode()).hexdigest()[:16],
+            })
+        return response
+
+    async def get_self(self, _: web.Request) -> web.Response:
+        return json_response(user_payload(1, bot=True))
+
+    async def get_user(self, request: web.Request) -> web.Response:
+        return json_response(user_payload(int(request.match_info["user_id"])))
+
+    async def get_guild(self, _: web.Request) -> web.Response:
+        return json_response(self.guild.payload(with_members=False))
+
+    async def get_member(self, request: web.Request) -> web.Response:
+        member = self.guild.members.get(int(request.match_info["user_id"]))
+        if member is None:
+            return json_response({"message": "Unknown Member", "code": 10007}, status=404)
+        return json_response(member)
+
+    def message_payload(self, channel_id: str, message_id: int) -> dict[str, Any]:
+        return {
+            "id": str(message_id),
+            "channel_id": channel_id,
+            "guild_id": str(self.guild.id),
+            "author": user_payload(1, bot=True),
+            "content": "",
+            "timestamp": TIMESTAMP,
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": [],
+            "pinned": False,
+            "type": 0,
+            "flags": 0,
+            "components": [],
+        }
+
+    async def send_message(self, request: web.Request) -> web.Response:
+        await request.read()
+        return json_response(self.message_payload(request.match_info["channel_id"], next(self._message_ids)))
+
+    async def edit_message(self, request: web.Request) -> web.Response:
+        await request.read()
+        return json_response(
+            self.message_payload(request.match_info["channel_id"], int(request.match_info["message_id"]))
+        )
+
+    async def get_asset(self, _: web.Request) -> web.Response:
+        return web.Response(body=self.asset, content_type="image/png")
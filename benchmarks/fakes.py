@@ -0,0 +1,180 @@
+"""Synthetic stand-ins for discord.py objects, built at configurable scales without a gateway connection."""
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any
+
+import discord
+
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+# Guild channel classes use __slots__ and are normally built from gateway payloads,
+# instances are created bare so isinstance checks in the helpers behave like they do against real guilds.
+CHANNEL_CLASSES: list[type[discord.abc.GuildChannel]] = [
+    discord.TextChannel,
+    discord.TextChannel,
+    discord.TextChannel,
+    discord.VoiceChannel,
+    discord.StageChannel,
+    discord.ForumChannel,
+    discord.CategoryChannel,
+]
+
+
+def make_channel(channel_class: type[discord.abc.GuildChannel], channel_id: int, guild: Any) -> Any:
+    channel = channel_class.__new__(channel_class)
+    channel.id = channel_id
+    channel.name = f"channel-{channel_id}"
+    channel.guild = guild
+    return channel
+
+
+class FakeRole(SimpleNamespace):
+    # Roles are used as dict keys, like the real ones
+    __hash__ = object.__hash__
+
+    def __lt__(self, other: "FakeRole") -> bool:
+        # The @everyone role is the lowest, the rest are ordered like discord.Role
+        if self.is_default():
+            return not other.is_default()
+        return (self.position, -self.id) < (other.position, -other.id)
+
+    def is_default(self) -> bool:
+        return self.id == self.guild.id
+
+    @property
+    def members(self) -> list[Any]:
+        # Like discord.Role.members, a scan over every member of the guild on each access
+        all_members = list(self.guild.members)
+        if self.is_default():
+            return all_members
+        return [member for member in all_members if member._roles.has(self.id)]
+
+
+def make_role(role_id: int, position: int, guild: Any, rng: random.Random) -> Any:
+    return FakeRole(
+        id=role_id,
+        name=f"role-{role_id}" if position else "@everyone",
+        mention=f"<@&{role_id}>",
+        colour=discord.Colour(rng.randrange(0xFFFFFF)),
+        position=position,
+        guild=guild,
+    )
+
+
+def make_activities(rng: random.Random) -> list[discord.BaseActivity]:
+    start = EPOCH + timedelta(seconds=rng.randrange(10**7))
+    return rng.choice([
+        [],
+        [discord.Game(name=f"game-{rng.randrange(100)}", start=start)],
+        [discord.Streaming(name="stream", url="https://twitch.tv/example", platform="Twitch")],
+        [
+            discord.Activity(
+                name=f"app-{rng.randrange(100)}",
+                type=discord.ActivityType.playing,
+                details="Details",
+                state="State",
+                timestamps={"start": int(start.timestamp() * 1000)},
+            ),
+            discord.Game(name="second-game"),
+        ],
+    ])
+
+
+class FakeMember(SimpleNamespace):
+    @property
+    def roles(self) -> list[Any]:
+        # Like discord.Member.roles, looked up from the raw IDs and sorted on each access
+        result = [role for role_id in self._roles if (role := self.guild.get_role(role_id))]
+        result.append(self.guild.default_role)
+        result.sort()
+        return result
+
+
+def make_member(member_id: int, roles: list[Any], guild: Any, rng: random.Random) -> Any:
+    member_roles = rng.sample(roles, k=min(len(roles), rng.randrange(1, 8)))
+    return FakeMember(
+        id=member_id,
+        name=f"user{rng.randrange(10**9):09d}",
+        global_name=f"User {member_id}",
+        discriminator="0",
+        mention=f"<@{member_id}>",
+        bot=rng.random() < 0.02,
+        system=False,
+        created_at=EPOCH,
+        joined_at=EPOCH + timedelta(seconds=rng.randrange(10**8)),
+        timed_out_until=None,
+        colour=member_roles[0].colour if member_roles else discord.Colour.default(),
+        status=discord.Status.online,
+        desktop_status=discord.Status.online,
+        mobile_status=discord.Status.offline,
+        web_status=None,
+        flags=SimpleNamespace(did_rejoin=False),
+        guild=guild,
+        _roles=discord.utils.SnowflakeList(role.id for role in member_roles),
+        activities=make_activities(rng),
+        is_timed_out=lambda: False,
+    )
+
+
+def make_guild(*, members: int, channels: int, roles: int, seed: int = 0) -> Any:
+    rng = random.Random(seed)
+    guild = SimpleNamespace(id=1)
+    # The @everyone role shares its ID with the guild
+    guild_roles = [make_role(guild.id, 0, guild, rng)] + [
+        make_role(10**4 + index, index + 1, guild, rng) for index in range(roles)
+    ]
+    roles_by_id = {role.id: role for role in guild_roles}
+    guild_members = [
+        make_member(member_id, guild_roles[1:], guild, rng) for member_id in range(10**6, 10**6 + members)
+    ]
+    guild_channels = [
+        make_channel(CHANNEL_CLASSES[index % len(CHANNEL_CLASSES)], 10**5 + index, guild)
+        for index in range(channels)
+    ]
+    members_by_id = {member.id: member for member in guild_members}
+
+    guild.__dict__.update(
+        name="Benchmark guild",
+        description="A synthetic guild",
+        created_at=EPOCH,
+        owner=guild_members[0] if guild_members else None,
+        owner_id=guild_members[0].id if guild_members else None,
+        preferred_locale=discord.Locale.american_english,
+        vanity_url=None,
+        vanity_url_code=None,
+        splash=None,
+        discovery_splash=None,
+        icon=None,
+        banner=None,
+        nsfw_level=discord.NSFWLevel.default,
+        mfa_level=discord.MFALevel.require_2fa,
+        verification_level=discord.VerificationLevel.high,
+        default_notifications=discord.NotificationLevel.only_mentions,
+        explicit_content_filter=discord.ContentFilter.all_members,
+        features=[f"FEATURE_{index}" for index in range(30)],
+        members=guild_members,
+        chunked=True,
+        member_count=len(guild_members),
+        max_members=500_000,
+        channels=guild_channels,
+        stage_instances=[],
+        threads=[],
+        rules_channel=None,
+        afk_channel=None,
+        afk_timeout=300,
+        roles=guild_roles,
+        default_role=guild_roles[0],
+        get_role=roles_by_id.get,
+        emojis=[f"<:emoji{index}:{10**7 + index}>" for index in range(100)],
+        emoji_limit=250,
+        stickers=[],
+        sticker_limit=60,
+        filesize_limit=100 * 1024 * 1024,
+        bitrate_limit=384000.0,
+        premium_tier=3,
+        premium_subscription_count=20,
+        premium_subscriber_role=None,
+        get_member=members_by_id.get,
+    )
+    return guild
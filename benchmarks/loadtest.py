@@ -0,0 +1,251 @@
+"""
+Offline load test for the Thermometer cog's commands against a local fake Discord REST API and CDN.
+
+The cog is loaded into a real discord.py bot whose HTTP client and asset URLs point at the fake server.
+The gateway is never connected, the guild is built from a synthetic payload instead.
+
+Usage:
+    python benchmarks/loadtest.py --invocations 200 --concurrency 50 --latency 50 --rate-limit-chance 0.05
+    python benchmarks/loadtest.py --set profile_cache_max_age=0 --set whois_asset_deadline=0
+
+Settings not overridden with --set use their defaults from settings_schema.toml.
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import statistics
+import sys
+import time
+import tomllib
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable
+from unittest import mock
+
+import discord
+from breadcord.module import ModuleCog
+from discord.ext import commands
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_discord import API_PREFIX, FakeDiscord, FakeGuild  # noqa: E402
+
+MODULE_PATH = Path(__file__).resolve().parent.parent
+
+
+def load_module() -> Any:
+    spec = importlib.util.spec_from_file_location(
+        "thermometer",
+        MODULE_PATH / "__init__.py",
+        submodule_search_locations=[str(MODULE_PATH)],
+    )
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["thermometer"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_settings(overrides: list[str]) -> SimpleNamespace:
+    schema = tomllib.loads((MODULE_PATH / "settings_schema.toml").read_text())
+    values = {key: entry["value"] for key, entry in schema.items()}
+    for override in overrides:
+        key, _, value = override.partition("=")
+        values[key] = json.loads(value)
+    return SimpleNamespace(**{key: SimpleNamespace(value=value) for key, value in values.items()})
+
+
+class FakeContext:
+    """Just enough of commands.Context for the command callbacks, replies are sent through the real HTTP client."""
+
+    def __init__(self, guild: discord.Guild, channel: discord.TextChannel, author: discord.Member) -> None:
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+
+    async def reply(self, content: str | None = None, *, ephemeral: bool = False, **kwargs: Any) -> discord.Message:
+        return await self.channel.send(content, **kwargs)
+
+    async def defer(self, *, ephemeral: bool = False) -> None:
+        pass
+
+
+class FakeInteraction:
+    def __init__(self, channel: discord.TextChannel, user: discord.Member) -> None:
+        self.channel = channel
+        self.user = user
+        self.response = SimpleNamespace(send_message=self._send_message)
+
+    async def _send_message(self, content: str | None = None, *, ephemeral: bool = False, **kwargs: Any) -> None:
+        await self.channel.send(content, **kwargs)
+
+    async def edit_original_response(self, **_: Any) -> None:
+        pass
+
+
+def peak_rss() -> int:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def run_command(
+    name: str,
+    invoke: Callable[[int], Awaitable[Any]],
+    *,
+    invocations: int,
+    concurrency: int,
+    server: FakeDiscord,
+) -> dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors: Counter[str] = Counter()
+
+    async def timed(index: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await invoke(index)
+            except Exception as error:
+                errors[type(error).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    requests_before = server.requests.copy()
+    rate_limited_before = server.rate_limited
+    start = time.perf_counter()
+    await asyncio.gather(*map(timed, range(invocations)))
+    duration = time.perf_counter() - start
+    requests = server.requests - requests_before
+
+    latencies.sort()
+    result = {
+        "invocations": invocations,
+        "throughput": invocations / duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "requests_per_invocation": sum(requests.values()) / invocations,
+        "rate_limited": server.rate_limited - rate_limited_before,
+        "requests": dict(requests),
+        "errors": dict(errors),
+    }
+    print(
+        f"{name:<20} p50 {result['p50_ms']:8.1f} ms   p99 {result['p99_ms']:8.1f} ms   "
+        f"{result['requests_per_invocation']:5.2f} requests/invocation   {result['throughput']:7.1f}/s"
+        + (f"   errors: {dict(errors)}" if errors else "")
+    )
+    return result
+
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    fake_guild = FakeGuild(members=args.members, channels=args.channels, roles=args.roles)
+    server = FakeDiscord(
+        fake_guild,
+        latency=args.latency / 1000,
+        cdn_latency=args.cdn_latency / 1000,
+        rate_limit_chance=args.rate_limit_chance,
+        asset_bytes=args.asset_bytes,
+    )
+    base_url = await server.start()
+    discord.http.Route.BASE = base_url + API_PREFIX
+    discord.asset.Asset.BASE = base_url
+
+    bot = commands.Bot(
+        command_prefix="!",
+        intents=discord.Intents.all(),
+        member_cache_flags=discord.MemberCacheFlags.from_intents(discord.Intents.all()),
+    )
+    async with bot:
+        state = bot._connection
+        state.user = discord.ClientUser(state=state, data=await bot.http.static_login("load-test-token"))
+        guild = discord.Guild(data=fake_guild.payload(), state=state)
+        state._add_guild(guild)
+        channel = guild.text_channels[0]
+        members = guild.members
+
+        settings = load_settings(args.set)
+
+        def fake_module_cog_init(cog: ModuleCog, module_id: str) -> None:
+            cog.bot = bot
+            cog.settings = settings
+            cog.logger = logging.getLogger(module_id)
+            cog.module = SimpleNamespace(id=module_id, storage_path=Path(args.storage))
+
+        thermometer = load_module()
+        with mock.patch.object(ModuleCog, "__init__", fake_module_cog_init):
+            cog = thermometer.Thermometer("thermometer")
+        await cog.cog_load()
+
+        def target(index: int) -> discord.Member:
+            # A small pool of targets, so caches and request coalescing get exercised like with popular users
+            return members[index % args.distinct_targets]
+
+        mentioned_roles = " ".join(f"<@&{role.id}>" for role in guild.roles[1:11])
+        role_message = discord.Message(
+            state=state,
+            channel=channel,
+            data={
+                **server.message_payload(str(channel.id), 1),
+                "content": mentioned_roles,
+                "mention_roles": [str(role.id) for role in guild.roles[1:11]],
+            },
+        )
+
+        commands_to_run: dict[str, Callable[[int], Awaitable[Any]]] = {
+            "whois": lambda index: cog.whois.callback(
+                cog, FakeContext(guild, channel, members[-1 - index % len(members)]), target(index)
+            ),
+            "guild info": lambda index: cog.guild_info.callback(cog, FakeContext(guild, channel, members[0])),
+            "Who got mentioned": lambda index: cog.role_mention_members_ctx_menu(
+                FakeInteraction(channel, members[index % len(members)]), role_message
+            ),
+        }
+        results: dict[str, Any] = {}
+        for name, invoke in commands_to_run.items():
+            if args.commands and name not in args.commands:
+                continue
+            results[name] = await run_command(
+                name,
+                invoke,
+                invocations=args.invocations,
+                concurrency=args.concurrency,
+                server=server,
+            )
+
+        await cog.cog_unload()
+    await server.stop()
+
+    report = {"results": results, "peak_rss_bytes": peak_rss()}
+    print(f"Peak RSS: {report['peak_rss_bytes'] / 1024 / 1024:.1f} MB")
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invocations", type=int, default=200, help="Invocations per command.")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--commands", nargs="*", help="Only run these commands.")
+    parser.add_argument("--distinct-targets", type=int, default=20, help="How many different users whois looks up.")
+    parser.add_argument("--members", type=int, default=10_000)
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--roles", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=50, help="REST latency in milliseconds.")
+    parser.add_argument("--cdn-latency", type=float, default=20, help="CDN latency in milliseconds.")
+    parser.add_argument("--rate-limit-chance", type=float, default=0.0, help="Share of REST requests answered with 429.")
+    parser.add_argument("--asset-bytes", type=int, default=256 * 1024, help="Size of every avatar and banner.")
+    parser.add_argument("--storage", default="loadtest_storage", help="Storage directory for the disk asset store.")
+    parser.add_argument("--set", action="append", default=[], metavar="SETTING=JSON", help="Override a setting.")
+    parser.add_argument("--output", type=Path, help="Write the report as JSON to this file.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    final_report = asyncio.run(main(arguments))
+    if arguments.output:
+        arguments.output.write_text(json.dumps(final_report, indent=4))
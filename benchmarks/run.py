@@ -0,0 +1,122 @@
+"""
+Offline microbenchmarks for the Thermometer helpers.
+
+Usage:
+    python benchmarks/run.py --members 500000 --channels 500 --roles 250 --output results.json
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json --tolerance 0.25
+
+When comparing against a baseline, the process exits with status 1 if any benchmark got slower than the tolerance allows.
+benchmarks/baseline.json was recorded with the default arguments, timings depend on the machine,
+so record a new baseline before comparing on different hardware.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import make_guild  # noqa: E402
+from helpers import GuildInfoHelper, WhoisHelper, build_info_embeds, guild_stats  # noqa: E402
+
+
+async def time_calls(func: Callable[[], Awaitable[Any] | Any], repeat: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        if asyncio.iscoroutine(result):
+            await result
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def run_benchmarks(guild: Any, repeat: int) -> dict[str, dict[str, float]]:
+    members = guild.members
+    guild_info = await GuildInfoHelper.get_guild_info(guild)
+    member_details = await WhoisHelper.get_user_details(members[0]) | await WhoisHelper.get_member_details(members[0])
+
+    def cold_guild_info() -> Awaitable[dict[str, Any]]:
+        guild_stats.forget(guild.id)
+        return GuildInfoHelper.get_guild_info(guild)
+
+    benchmarks: dict[str, Callable[[], Any]] = {
+        "get_guild_info (cold)": cold_guild_info,
+        "get_guild_info (warm)": lambda: GuildInfoHelper.get_guild_info(guild),
+        "build_info_embeds (guild)": lambda: build_info_embeds(guild_info, title="Guild info", inline_fields=False),
+        "build_info_embeds (member)": lambda: build_info_embeds(member_details, title="User info"),
+        "get_member_details": lambda: WhoisHelper.get_member_details(members[len(members) // 2]),
+        "get_member_activity_embeds": lambda: WhoisHelper.get_member_activity_embeds(members[len(members) // 3]),
+        "guild_members sort": lambda: sorted(members, key=lambda x: x.name),
+        # The role mention lookup, reading Role.members per role against a single pass over the members
+        "Role.members (10 roles)": lambda: {role: role.members for role in guild.roles[1:11]},
+        "get_role_members (10 roles)": lambda: GuildInfoHelper.get_role_members(members, guild.roles[1:11]),
+    }
+
+    results: dict[str, dict[str, float]] = {}
+    for name, func in benchmarks.items():
+        timings = await time_calls(func, repeat)
+        results[name] = {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "max": max(timings),
+        }
+        print(f"{name:<35} min {results[name]['min'] * 1000:10.3f} ms   median {results[name]['median'] * 1000:10.3f} ms")
+    return results
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float) -> bool:
+    ok = True
+    for name, timings in results.items():
+        if name not in baseline:
+            continue
+        previous, current = baseline[name]["median"], timings["median"]
+        change = (current - previous) / previous if previous else 0
+        status = "REGRESSION" if change > tolerance else "ok"
+        if change > tolerance:
+            ok = False
+        print(f"{name:<35} {change:+8.1%}  {status}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=50_000)
+    parser.add_argument("--channels", type=int, default=500)
+    parser.add_argument("--roles", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", type=Path, help="Compare the results against this JSON file.")
+    parser.add_argument("--save-baseline", type=Path, help="Store the results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown as a fraction of the baseline.")
+    args = parser.parse_args()
+
+    print(f"Building guild with {args.members} members, {args.channels} channels and {args.roles} roles")
+    guild = make_guild(members=args.members, channels=args.channels, roles=args.roles, seed=args.seed)
+    results = asyncio.run(run_benchmarks(guild, args.repeat))
+    report = {
+        "scale": {"members": args.members, "channels": args.channels, "roles": args.roles},
+        "results": results,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=4))
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(report, indent=4))
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["scale"] != report["scale"]:
+            print(f"Warning: baseline was recorded at a different scale ({baseline['scale']})")
+        if not compare(results, baseline["results"], args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
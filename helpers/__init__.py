@@ -1,3 +1,12 @@
+from .cache import AssetCache, DiskAssetStore, ProfileCache
+from .export import EXPORT_COLUMNS, ExportFormat, ExportKind, export_rows, export_sources, write_export
 from .general import *
 from .guildinfo import GuildInfoHelper
+from .guildstats import ApproximateCounts, GuildStats, GuildStatsTracker, guild_stats
+from .health import HealthMonitor, HealthSample
+from .metrics import Histogram, Metrics, metrics
+from .offload import Offloader, offloader
+from .paginator import PaginatedView, RoleMembersView
+from .render import MESSAGE_EMBED_COUNT_LIMIT, MESSAGE_EMBEDS_LIMIT, InfoLayout, build_info_embeds, truncate
+from .scheduler import RouteScheduler, SingleFlight, route_scheduler, single_flight
 from .whois import WhoisHelper
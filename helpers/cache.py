@@ -0,0 +1,235 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+
+class AssetCache:
+    """
+    Byte-budgeted LRU cache for downloaded asset data.
+
+    Entries are keyed on the asset URL, so animated and static variants of the same asset are stored separately.
+    Since the asset hash is part of the URL, a changed avatar or banner simply becomes a new key,
+    and the old entry ages out through the TTL or gets evicted once the byte budget is exceeded.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._total_bytes = 0
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        data, expires_at = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if key in self._entries:
+            self._remove(key)
+        if len(data) > self.max_bytes:
+            return
+        self._entries[key] = (data, time.monotonic() + self.ttl)
+        self._total_bytes += len(data)
+        while self._total_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: str) -> None:
+        data, _ = self._entries.pop(key)
+        self._total_bytes -= len(data)
+
+
+class ProfileCache:
+    """
+    Cache for fully fetched users and members, keyed on (guild ID, user ID).
+
+    Users fetched outside a guild are stored with a guild ID of None.
+    Entries are expected to be invalidated from gateway events, the max age only bounds how stale
+    data can get for changes the gateway doesn't tell us about (such as banners).
+    """
+
+    def __init__(self, max_age: float, max_entries: int = 1024) -> None:
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[int | None, int], tuple[Any, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, guild_id: int | None, user_id: int) -> Any | None:
+        key = (guild_id, user_id)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, guild_id: int | None, user_id: int, profile: Any) -> None:
+        if self.max_age <= 0:
+            return
+        key = (guild_id, user_id)
+        self._entries[key] = (profile, time.monotonic() + self.max_age)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, guild_id: int | None, user_id: int) -> None:
+        self._entries.pop((guild_id, user_id), None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        for key in [key for key in self._entries if key[1] == user_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class DiskAssetStore:
+    """
+    Size-capped LRU store for downloaded asset data on disk, which survives restarts.
+
+    Files are named after a hash of the asset URL. Since the URL contains the asset's own hash, a file never goes stale,
+    a changed avatar or banner is simply stored under a new name while the old one gets evicted over time.
+    The store does nothing until it's given a directory with configure().
+    """
+
+    def __init__(self) -> None:
+        self.path: Path | None = None
+        self.max_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._total_bytes = 0
+        self._entries: OrderedDict[str, int] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def configure(self, path: Path, max_bytes: int) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._entries.clear()
+        self._total_bytes = 0
+        # Oldest modification time first, files are touched when used so this restores the LRU order
+        for file in sorted(path.glob("*.bin"), key=lambda file: file.stat().st_mtime):
+            size = file.stat().st_size
+            self._entries[file.name] = size
+            self._total_bytes += size
+        self._evict()
+
+    def get(self, key: str) -> Path | None:
+        if self.path is None:
+            return None
+        name = self._file_name(key)
+        if name not in self._entries:
+            self.misses += 1
+            return None
+        file = self.path / name
+        try:
+            os.utime(file)
+        except FileNotFoundError:
+            self._total_bytes -= self._entries.pop(name)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(name)
+        self.hits += 1
+        return file
+
+    async def put(self, key: str, data: bytes) -> Path:
+        assert self.path is not None, "Disk asset store is not configured"
+        name = self._file_name(key)
+        file = self.path / name
+        await asyncio.to_thread(self._write, file, data)
+        if name in self._entries:
+            self._total_bytes -= self._entries.pop(name)
+        self._entries[name] = len(data)
+        self._total_bytes += len(data)
+        self._evict(keep=name)
+        return file
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    @staticmethod
+    def _file_name(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest() + ".bin"
+
+    @staticmethod
+    def _write(file: Path, data: bytes) -> None:
+        # A unique temporary file, concurrent writes of the same asset would otherwise replace each other's
+        descriptor, temporary_name = tempfile.mkstemp(dir=file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as temporary_file:
+                temporary_file.write(data)
+            os.replace(temporary_name, file)
+        except BaseException:
+            os.unlink(temporary_name)
+            raise
+
+    def _evict(self, keep: str | None = None) -> None:
+        assert self.path is not None
+        while self._total_bytes > self.max_bytes and self._entries:
+            name = next(iter(self._entries))
+            if name == keep:
+                break
+            self._total_bytes -= self._entries.pop(name)
+            self.evictions += 1
+            try:
+                (self.path / name).unlink(missing_ok=True)
+            except OSError:  # Still open for an upload on platforms that don't allow removing open files
+                pass
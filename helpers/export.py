@@ -0,0 +1,107 @@
+import csv
+import gzip
+import io
+import json
+import time
+from tempfile import SpooledTemporaryFile
+from typing import Any, Callable, Iterable, Iterator, Literal
+
+import discord
+
+ExportKind = Literal["members", "channels", "roles", "emojis"]
+ExportFormat = Literal["csv", "jsonl"]
+
+# Exports smaller than this stay in memory, larger ones are moved to a temporary file on disk
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+def _timestamp(moment: Any) -> int | None:
+    return int(time.mktime(moment.timetuple())) if moment else None
+
+
+EXPORT_COLUMNS: dict[ExportKind, dict[str, Callable[[Any], Any]]] = {
+    "members": {
+        "id": lambda member: member.id,
+        "username": lambda member: member.name,
+        "global_name": lambda member: member.global_name,
+        "nickname": lambda member: member.nick,
+        "bot": lambda member: member.bot,
+        "created_at": lambda member: _timestamp(member.created_at),
+        "joined_at": lambda member: _timestamp(member.joined_at),
+        # noinspection PyProtectedMember
+        "role_ids": lambda member: " ".join(map(str, member._roles)),
+    },
+    "channels": {
+        "id": lambda channel: channel.id,
+        "name": lambda channel: channel.name,
+        "type": lambda channel: str(channel.type),
+        "category_id": lambda channel: channel.category_id,
+        "position": lambda channel: channel.position,
+    },
+    "roles": {
+        "id": lambda role: role.id,
+        "name": lambda role: role.name,
+        "colour": lambda role: str(role.colour),
+        "position": lambda role: role.position,
+        "permissions": lambda role: role.permissions.value,
+        "hoisted": lambda role: role.hoist,
+        "mentionable": lambda role: role.mentionable,
+        "managed": lambda role: role.managed,
+    },
+    "emojis": {
+        "id": lambda emoji: emoji.id,
+        "name": lambda emoji: emoji.name,
+        "animated": lambda emoji: emoji.animated,
+        "managed": lambda emoji: emoji.managed,
+        "available": lambda emoji: emoji.available,
+        "url": lambda emoji: emoji.url,
+    },
+}
+
+
+def export_sources(guild: discord.Guild, kind: ExportKind, /) -> list[Any]:
+    """Snapshots the objects to export, these are list copies that the gateway can't change while they're written."""
+    return {
+        "members": lambda: guild.members,
+        "channels": lambda: guild.channels,
+        "roles": lambda: guild.roles,
+        "emojis": lambda: list(guild.emojis),
+    }[kind]()
+
+
+def export_rows(kind: ExportKind, items: Iterable[Any], /) -> Iterator[dict[str, Any]]:
+    columns = EXPORT_COLUMNS[kind]
+    for item in items:
+        yield {name: getter(item) for name, getter in columns.items()}
+
+
+def write_export(
+    rows: Iterable[dict[str, Any]],
+    columns: Iterable[str],
+    /,
+    *,
+    file_format: ExportFormat,
+    compress: bool,
+) -> SpooledTemporaryFile:
+    """
+    Writes rows as CSV or JSON lines into a spooled temporary file, row by row.
+
+    :return: The file, positioned at its start.
+    """
+    file = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    binary: io.IOBase = gzip.GzipFile(fileobj=file, mode="wb") if compress else file
+    text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+    if file_format == "csv":
+        writer = csv.DictWriter(text, fieldnames=list(columns))
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            text.write(json.dumps(row, ensure_ascii=False))
+            text.write("\n")
+    text.flush()
+    text.detach()
+    if compress:
+        binary.close()  # Writes the gzip trailer, the underlying file is left open
+    file.seek(0)
+    return file
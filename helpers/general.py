@@ -1,9 +1,35 @@
+import asyncio
+from collections import OrderedDict
 from datetime import timedelta, datetime
 from io import BytesIO
+from pathlib import Path
 from typing import Any, overload
 
+import aiohttp
 import discord
 
+from .cache import AssetCache, DiskAssetStore
+from .scheduler import single_flight
+
+# Defaults only, the cog applies the configured limits when it's loaded
+asset_cache = AssetCache(max_bytes=64 * 1024 * 1024, ttl=60 * 60)
+# Disabled unless the cog configures it, takes the place of asset_cache when enabled
+asset_store = DiskAssetStore()
+
+ASSET_SIZES: tuple[int, ...] = (4096, 2048, 1024, 512, 256, 128)
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Upload limit outside of guilds, e.g. in DMs
+DEFAULT_FILESIZE_LIMIT = discord.utils.DEFAULT_FILE_SIZE_LIMIT_BYTES
+
+# The CDN size picked per (asset URL, max_bytes), or None if no size fits,
+# so later downloads don't request the sizes that are known to be too large again
+fitting_sizes: OrderedDict[tuple[str, int], int | None] = OrderedDict()
+FITTING_SIZES_MAX_ENTRIES = 10_000
+
+
+class AssetTooLarge(Exception):
+    pass
+
 
 def info_to_string(info: dict[Any, Any]) -> str:
     return "".join(f"**{key}:** {value}\n" for key, value in info.items() if value is not None)
@@ -47,45 +73,156 @@ def convert_bytes(bytes: int) -> tuple[float, str]:
     return working, "TB"
 
 
-def build_info_embed(
-    info: dict[str, Any | None],
-    /,
-    *,
-    title: str,
-    colour: discord.Colour | discord.Color | None = None,
-    thumbnail: str | None = None,
-    image: str | None = None,
-    inline_fields: bool = True
-) -> discord.Embed:
-    embed = discord.Embed(title=title, colour=colour, timestamp=datetime.now())
-    embed.set_thumbnail(url=thumbnail)
-    embed.set_image(url=image)
-
-    embed.description = ""
-    for key, value in info.items():
-        if isinstance(value, dict):
-            embed.add_field(name=key, value=info_to_string(value), inline=inline_fields)
+def get_cached_asset(url: str) -> bytes | Path | None:
+    if asset_store.enabled:
+        try:
+            return asset_store.get(url)
+        except OSError:  # A broken disk cache is treated like a miss
+            return None
+    return asset_cache.get(url)
+
+
+async def cache_asset(url: str, data: bytes) -> bytes | Path:
+    """Stores downloaded asset data, returning where it can be read from from now on."""
+    if asset_store.enabled:
+        try:
+            return await asset_store.put(url, data)
+        except OSError:  # E.g. a full disk, the data is still usable from memory
+            return data
+    asset_cache.put(url, data)
+    return data
+
+
+async def read_bounded(session: aiohttp.ClientSession, url: str, max_bytes: int) -> bytes | None:
+    """
+    Streams a download into memory, giving up as soon as it's known to be larger than max_bytes.
+
+    :return: The downloaded data, or None if the URL points to a 404 page.
+    :raises AssetTooLarge: If the download is larger than max_bytes.
+    """
+    async with session.get(url) as response:
+        if response.status == 404:
+            return None
+        response.raise_for_status()
+        # The response headers are all a HEAD request would tell us, so this costs no extra round trip
+        if response.content_length is not None and response.content_length > max_bytes:
+            raise AssetTooLarge
+        buffer = bytearray()
+        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+            buffer += chunk
+            if len(buffer) > max_bytes:
+                raise AssetTooLarge
+        return bytes(buffer)
+
+
+async def read_largest_fitting(
+    asset: discord.Asset,
+    session: aiohttp.ClientSession,
+    max_bytes: int,
+) -> bytes | Path | None:
+    """Downloads the largest CDN size of an asset that is at most max_bytes large."""
+    key = (asset.url, max_bytes)
+    sizes = ASSET_SIZES
+    if key in fitting_sizes:
+        fitting_sizes.move_to_end(key)
+        if (known_size := fitting_sizes[key]) is None:
+            return None
+        sizes = ASSET_SIZES[ASSET_SIZES.index(known_size):]
+
+    def remember(fitting_size: int | None) -> None:
+        fitting_sizes[key] = fitting_size
+        if len(fitting_sizes) > FITTING_SIZES_MAX_ENTRIES:
+            fitting_sizes.popitem(last=False)
+
+    for size in sizes:
+        url = asset.with_size(size).url
+        if (cached := get_cached_asset(url)) is not None:
+            remember(size)
+            return cached
+        try:
+            data = await read_bounded(session, url, max_bytes)
+        except AssetTooLarge:
             continue
-        embed.description += info_to_string({key: value})
-    return embed
+        if data is None:
+            return None
+        remember(size)
+        return await cache_asset(url, data)
+    remember(None)
+    return None
+
+
+async def read_asset(asset: discord.Asset) -> bytes | Path | None:
+    if (cached := get_cached_asset(asset.url)) is not None:
+        return cached
+    try:
+        data = await asset.read()
+    except discord.NotFound:  # There are cases where an asset points to a 404 page
+        return None
+    return await cache_asset(asset.url, data)
 
 
-async def fetch_asset(asset: discord.Asset | None, filename: str | None) -> discord.File | None:
+async def fetch_asset(
+    asset: discord.Asset | None,
+    filename: str | None,
+    *,
+    session: aiohttp.ClientSession | None = None,
+    max_bytes: int | None = None,
+) -> discord.File | None:
     """
     More fail-safe reimplementation of discord.Asset.to_file().
 
     :param asset: Asset to convert to a file
     :param filename: Filename to use for the file. If none is provided it will be set to the asset key.
+    :param session: Session to stream the download with. Required for max_bytes to have any effect.
+    :param max_bytes: Maximum file size. The largest CDN size that fits within it is downloaded.
     :return: discord.File object or None if the asset could not be fetched.
     """
     if asset is None:
         return None
+    data: bytes | Path | None
     try:
-        data = await asset.read()
-    except discord.NotFound:  # There are cases where an asset points to a 404 page
+        if session is not None and max_bytes is not None:
+            data = await single_flight.run(
+                ("asset", asset.url, max_bytes),
+                lambda: read_largest_fitting(asset, session, max_bytes),
+            )
+        else:
+            data = await single_flight.run(("asset", asset.url), lambda: read_asset(asset))
+    except (aiohttp.ClientError, discord.HTTPException, asyncio.TimeoutError):
+        # The CDN failing shouldn't fail the whole command, it's sent without the asset instead
+        return None
+    if data is None:
         return None
+    if isinstance(data, Path):
+        # Uploaded straight from the file handle, the data is never loaded into memory as a whole
+        try:
+            file = discord.File(fp=str(data), filename=asset.key)
+        except OSError:  # Evicted or otherwise gone since it was looked up
+            return None
     else:
+        # A BytesIO initialised from bytes shares the buffer until written to, so cached data isn't copied here
         file = discord.File(fp=BytesIO(data), filename=asset.key)
-        if filename:
-            file.filename = f"{filename}.gif" if asset.is_animated() else f"{filename}.png"
-        return file
+    if filename:
+        file.filename = f"{filename}.gif" if asset.is_animated() else f"{filename}.png"
+    return file
+
+
+def discard_asset(task: "asyncio.Task[discord.File | None]") -> None:
+    """Cancels a fetch_asset task whose file won't be sent, closing the file if it was already opened."""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled() and task.exception() is None and (file := task.result()) is not None:
+        file.close()
+
+
+def attach_assets(
+    embed: discord.Embed,
+    thumbnail: discord.File | None,
+    image: discord.File | None,
+) -> list[discord.File]:
+    """Points the embed's thumbnail and image at the given files, returning the files that have to be attached."""
+    if thumbnail:
+        embed.set_thumbnail(url=f"attachment://{thumbnail.filename}")
+    if image:
+        embed.set_image(url=f"attachment://{image.filename}")
+    return [file for file in (thumbnail, image) if file is not None]
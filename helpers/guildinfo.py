@@ -5,16 +5,48 @@ from typing import Any, cast
 import discord
 
 from . import convert_bytes
+from .guildstats import ApproximateCounts, guild_stats
 
 
 class GuildInfoHelper:
     @staticmethod
-    async def get_guild_info(guild: discord.Guild, /) -> dict[str, Any]:
+    def get_role_members(
+        members: list[discord.Member],
+        roles: list[discord.Role],
+        /,
+    ) -> dict[discord.Role, list[discord.Member]]:
+        """
+        Gets the members of several roles with a single pass over a guild's members.
+
+        Reading Role.members scans every member of the guild, so doing that per role multiplies the work.
+        """
+        role_members: dict[int, list[discord.Member]] = {role.id: [] for role in roles}
+        for member in members:
+            # noinspection PyProtectedMember
+            for role_id in member._roles:  # The raw role IDs, Member.roles would build and sort Role objects
+                if (role_list := role_members.get(role_id)) is not None:
+                    role_list.append(member)
+        return {role: role_members[role.id] for role in roles}
+
+    @staticmethod
+    async def get_guild_info(
+        guild: discord.Guild,
+        /,
+        approximate_counts: ApproximateCounts | None = None,
+    ) -> dict[str, Any]:
         created_at = round(time.mktime(guild.created_at.timetuple()))
         nsfw_level = cast(Enum, guild.nsfw_level).name.title() if guild.nsfw_level != discord.NSFWLevel.default else None
         filesize_limit, filesize_unit = convert_bytes(guild.filesize_limit)
-        bot_count = len([member for member in guild.members if member.bot])
+        stats = await guild_stats.fetch(guild)
+        bot_count = stats.bot_count
         human_count: int | None = guild.member_count - bot_count if guild.member_count else None
+        member_count = f"{guild.member_count}/{guild.max_members}" if guild.member_count else None
+        online_count: int | None = None
+        if approximate_counts is not None:
+            # Bots can't be told apart from humans without the member list
+            human_count = None
+            member_count = f"~{approximate_counts.members}/{guild.max_members}" if approximate_counts.members else None
+            online_count = approximate_counts.presences
 
         # noinspection PyUnresolvedReferences
         return {
@@ -35,12 +67,12 @@ class GuildInfoHelper:
             "Content filter level": guild.explicit_content_filter.name.replace("_", " ").title(),
             "Features": ", ".join(f"`{feature}`" for feature in sorted(guild.features)),
             "Channels": {
-                "Channels": len(guild.channels) - len(guild.categories),
-                "Text channels": len(guild.text_channels),
-                "Voice channels": len(guild.voice_channels),
-                "Stage channels": f"{len(guild.stage_channels)} ({len(guild.stage_instances)} active)",
-                "Forum channels": len(guild.forums),
-                "Categories": len(guild.categories),
+                "Channels": stats.channel_count,
+                "Text channels": stats.count_of(discord.TextChannel),
+                "Voice channels": stats.count_of(discord.VoiceChannel),
+                "Stage channels": f"{stats.count_of(discord.StageChannel)} ({len(guild.stage_instances)} active)",
+                "Forum channels": stats.count_of(discord.ForumChannel),
+                "Categories": stats.category_count,
                 "Threads": len(guild.threads),
                 "Rules channel": guild.rules_channel.mention if guild.rules_channel else None,
                 "AFK channel": f"{guild.afk_channel.mention} ({guild.afk_timeout} second timeout)"
@@ -48,7 +80,8 @@ class GuildInfoHelper:
                 else None,
             },
             "Stats": {
-                "Members": f"{guild.member_count}/{guild.max_members}" if guild.member_count else None,
+                "Members": member_count,
+                "Online": f"~{online_count}" if online_count else None,
                 "Bots": bot_count if human_count else None,
                 "Humans": human_count if human_count else None,
                 "Bot/human ratio": f"{round(bot_count/human_count, 3)} bots per human" if human_count else None,
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from collections import Counter
+from typing import NamedTuple
+
+import discord
+
+from .offload import offloader
+from .scheduler import single_flight
+
+CHANNEL_TYPES: tuple[type[discord.abc.GuildChannel], ...] = (
+    discord.CategoryChannel,
+    discord.TextChannel,
+    discord.StageChannel,
+    discord.VoiceChannel,
+    discord.ForumChannel,
+)
+
+
+def channel_kind(channel: discord.abc.GuildChannel) -> type[discord.abc.GuildChannel] | None:
+    for channel_type in CHANNEL_TYPES:
+        if isinstance(channel, channel_type):
+            return channel_type
+    return None
+
+
+class ApproximateCounts(NamedTuple):
+    members: int | None
+    presences: int | None
+
+
+class GuildStats:
+    """Counters for a single guild, built from the cache once and then kept up to date from gateway events."""
+
+    def __init__(
+        self,
+        members: list[discord.Member],
+        channels: list[discord.abc.GuildChannel],
+        chunked: bool,
+        /,
+    ) -> None:
+        # Whether the members were the complete member list, the bot count is only right if they were
+        self.chunked = chunked
+        self.bot_count: int = sum(1 for member in members if member.bot)
+        self.channel_counts: Counter[type[discord.abc.GuildChannel] | None] = Counter(
+            channel_kind(channel) for channel in channels
+        )
+
+    @property
+    def category_count(self) -> int:
+        return self.channel_counts[discord.CategoryChannel]
+
+    @property
+    def channel_count(self) -> int:
+        """Amount of channels, not counting categories."""
+        return self.channel_counts.total() - self.category_count
+
+    def count_of(self, channel_type: type[discord.abc.GuildChannel]) -> int:
+        return self.channel_counts[channel_type]
+
+
+class GuildStatsTracker:
+    def __init__(self, approximate_counts_max_age: float = 300) -> None:
+        self.approximate_counts_max_age = approximate_counts_max_age
+        self._stats: dict[int, GuildStats] = {}
+        self._approximate_counts: dict[int, tuple[ApproximateCounts, float]] = {}
+        self._chunk_tasks: dict[int, asyncio.Task[object]] = {}
+
+    def _cached(self, guild: discord.Guild, /) -> GuildStats | None:
+        stats = self._stats.get(guild.id)
+        # Counters built from a partial member list are rebuilt once the guild is chunked, whoever chunked it
+        if stats is not None and guild.chunked and not stats.chunked:
+            return None
+        return stats
+
+    def get(self, guild: discord.Guild, /) -> GuildStats:
+        if (stats := self._cached(guild)) is None:
+            stats = self._stats[guild.id] = GuildStats(guild.members, guild.channels, guild.chunked)
+        return stats
+
+    async def fetch(self, guild: discord.Guild, /) -> GuildStats:
+        """Like get(), but builds the counters of large guilds in a worker thread."""
+        if (stats := self._cached(guild)) is None:
+            # Both properties return list copies, so the gateway can't change them while the worker reads them.
+            # Events that arrive while the counters are being built are missed, which only skews the counts slightly.
+            chunked = guild.chunked
+            members, channels = guild.members, guild.channels
+            stats = await offloader.run(len(members), GuildStats, members, channels, chunked)
+            if (existing := self._cached(guild)) is not None:
+                stats = existing
+            else:
+                self._stats[guild.id] = stats
+        return stats
+
+    def forget(self, guild_id: int, /) -> None:
+        self._stats.pop(guild_id, None)
+        self._approximate_counts.pop(guild_id, None)
+
+    def clear(self) -> None:
+        self._stats.clear()
+        self._approximate_counts.clear()
+
+    async def approximate_counts(self, client: discord.Client, guild: discord.Guild, /) -> ApproximateCounts:
+        """Gets the approximate member and presence counts of a guild, for when its member list isn't cached."""
+        cached = self._approximate_counts.get(guild.id)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        # Concurrent callers for a guild whose counts aren't cached share a single request
+        fetched = await single_flight.run(
+            ("guild counts", guild.id),
+            lambda: client.fetch_guild(guild.id, with_counts=True),
+        )
+        counts = ApproximateCounts(fetched.approximate_member_count, fetched.approximate_presence_count)
+        self._approximate_counts[guild.id] = (counts, time.monotonic() + self.approximate_counts_max_age)
+        return counts
+
+    async def chunk(self, guild: discord.Guild, /) -> None:
+        """Requests the guild's member list, sharing a single in-flight request between concurrent callers."""
+        if (task := self._chunk_tasks.get(guild.id)) is None:
+            task = self._chunk_tasks[guild.id] = asyncio.create_task(guild.chunk())
+            task.add_done_callback(lambda _: self._chunk_tasks.pop(guild.id, None))
+        await asyncio.shield(task)
+        # Counters built from the partial member list are wrong now
+        self.forget(guild.id)
+
+    def member_joined(self, member: discord.Member, /) -> None:
+        if member.bot and (stats := self._stats.get(member.guild.id)):
+            stats.bot_count += 1
+
+    def member_left(self, member: discord.Member, /) -> None:
+        if member.bot and (stats := self._stats.get(member.guild.id)):
+            stats.bot_count -= 1
+
+    def channel_created(self, channel: discord.abc.GuildChannel, /) -> None:
+        if stats := self._stats.get(channel.guild.id):
+            stats.channel_counts[channel_kind(channel)] += 1
+
+    def channel_deleted(self, channel: discord.abc.GuildChannel, /) -> None:
+        if stats := self._stats.get(channel.guild.id):
+            stats.channel_counts[channel_kind(channel)] -= 1
+
+    def channel_updated(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel, /) -> None:
+        # Text and news channels can be converted into each other, which changes nothing here, but better safe
+        if (before_kind := channel_kind(before)) == (after_kind := channel_kind(after)):
+            return
+        if stats := self._stats.get(after.guild.id):
+            stats.channel_counts[before_kind] -= 1
+            stats.channel_counts[after_kind] += 1
+
+
+guild_stats = GuildStatsTracker()
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import math
+import os
+import sys
+import time
+from collections import deque
+from typing import Callable, NamedTuple
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# How many times per block threshold the loop is checked, so blocks are caught and measured to within a fraction of it
+CHECKS_PER_THRESHOLD = 4
+
+
+class HealthSample(NamedTuple):
+    timestamp: float
+    loop_lag: float
+    gateway_latency: float
+    rss: int
+    task_count: int
+
+
+class BlockedLoop(NamedTuple):
+    timestamp: float
+    duration: float
+    commands: tuple[str, ...]
+
+
+def current_rss() -> int:
+    """Resident memory of the process in bytes, or the peak resident memory where the current value isn't available."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class HealthMonitor:
+    """
+    Samples event loop lag, gateway latency, memory usage and the amount of tasks into a fixed-size ring buffer.
+
+    Lag is measured as how much later than requested a short sleep wakes up, several times per block threshold,
+    so any block longer than the threshold is noticed. When it's over the block threshold, the commands that were
+    running at the time are recorded as having (possibly) blocked the loop. Each sample holds the worst lag
+    measured since the previous one.
+    """
+
+    def __init__(
+        self,
+        gateway_latency: Callable[[], float],
+        *,
+        interval: float = 1,
+        history: int = 3600,
+        block_threshold: float = 0.1,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.gateway_latency = gateway_latency
+        self.logger = logger or logging.getLogger(__name__)
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.samples: deque[HealthSample] = deque(maxlen=history)
+        self.blocks: deque[BlockedLoop] = deque(maxlen=100)
+        self.running_commands: dict[int, str] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._sample_forever())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def command_started(self, key: int, name: str) -> None:
+        self.running_commands[key] = name
+        # Not every way a command can end calls command_finished, e.g. discord.py skips after-invoke hooks
+        # of failed slash commands, so the command is also forgotten once the task running it is done
+        if (task := asyncio.current_task()) is not None:
+            task.add_done_callback(lambda _: self.command_finished(key))
+
+    def command_finished(self, key: int) -> None:
+        self.running_commands.pop(key, None)
+
+    async def _sample_forever(self) -> None:
+        check_interval = min(self.interval, self.block_threshold / CHECKS_PER_THRESHOLD)
+        next_sample = time.perf_counter() + self.interval
+        worst_lag = 0.0
+        while True:
+            expected = time.perf_counter() + check_interval
+            # Snapshot before sleeping, a command that blocks the loop has usually finished by the time we wake up
+            commands = tuple(self.running_commands.values())
+            await asyncio.sleep(check_interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            worst_lag = max(worst_lag, lag)
+            if lag > self.block_threshold:
+                commands = tuple(dict.fromkeys(commands + tuple(self.running_commands.values())))
+                self.blocks.append(BlockedLoop(time.time(), lag, commands))
+                self.logger.warning(
+                    f"Event loop was blocked for {lag * 1000:.0f} ms"
+                    + (f" while running {', '.join(commands)}" if commands else "")
+                )
+            if now < next_sample:
+                continue
+            next_sample = now + self.interval
+            self.samples.append(HealthSample(
+                timestamp=time.time(),
+                loop_lag=worst_lag,
+                gateway_latency=self.gateway_latency(),
+                rss=current_rss(),
+                task_count=len(asyncio.all_tasks()),
+            ))
+            worst_lag = 0.0
+
+    def summary(self, window: float) -> dict[str, dict[str, str] | str | None]:
+        """Percentiles of the samples taken in the last window seconds, in the format used by build_info_embeds."""
+        since = time.time() - window
+        samples = [sample for sample in self.samples if sample.timestamp >= since]
+        if not samples:
+            return {"Samples": "None yet"}
+
+        def describe(values: list[float], unit: Callable[[float], str]) -> dict[str, str]:
+            values.sort()
+            return {
+                "p50": unit(percentile(values, 0.5)),
+                "p95": unit(percentile(values, 0.95)),
+                "p99": unit(percentile(values, 0.99)),
+                "Max": unit(values[-1]),
+            }
+
+        milliseconds: Callable[[float], str] = lambda value: f"{value * 1000:.1f} ms"
+        megabytes: Callable[[float], str] = lambda value: f"{value / 1024 / 1024:.1f} MB"
+        blocks = [block for block in self.blocks if block.timestamp >= since]
+        # Latency is infinite or NaN until the gateway has acknowledged a heartbeat
+        gateway_latencies = [sample.gateway_latency for sample in samples if math.isfinite(sample.gateway_latency)]
+        return {
+            "Samples": f"{len(samples)} over the last {round(window / 60)} minutes",
+            "Blocked loop": "\n".join(
+                f"<t:{round(block.timestamp)}:R> for {block.duration * 1000:.0f} ms"
+                + (f" while running `{'`, `'.join(block.commands)}`" if block.commands else "")
+                for block in blocks[-5:]
+            ) or None,
+            "Event loop lag": describe([sample.loop_lag for sample in samples], milliseconds),
+            "Gateway latency": describe(gateway_latencies, milliseconds) if gateway_latencies else None,
+            "Memory (RSS)": describe([float(sample.rss) for sample in samples], megabytes),
+            "Tasks": describe([float(sample.task_count) for sample in samples], lambda value: str(round(value))),
+        }
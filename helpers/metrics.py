@@ -0,0 +1,129 @@
+import bisect
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from types import TracebackType
+from typing import Callable, ContextManager
+
+DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Statistics reported by collectors that only ever go up, the rest are exported as gauges
+COUNTER_STATS = frozenset({"hits", "misses", "evictions", "shared"})
+
+_disabled_phase = nullcontext()
+
+
+class Histogram:
+    __slots__ = ("buckets", "bucket_counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Phase:
+    __slots__ = ("metrics", "command", "phase", "start")
+
+    def __init__(self, metrics: "Metrics", command: str, phase: str) -> None:
+        self.metrics = metrics
+        self.command = command
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.metrics.observe(self.command, self.phase, time.perf_counter() - self.start)
+        if exc_type is not None:
+            self.metrics.record_error(self.command, self.phase)
+
+
+class Metrics:
+    """
+    Per-command, per-phase latency histograms and error counters, exported in the Prometheus text format.
+
+    While disabled, phase() hands out a shared no-op context manager so tracing costs next to nothing.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.latencies: defaultdict[tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.errors: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self.counters: defaultdict[str, int] = defaultdict(int)
+        self.collectors: dict[str, Callable[[], dict[str, int]]] = {}
+
+    def add_collector(self, name: str, stats: Callable[[], dict[str, int]]) -> None:
+        """Exports the statistics returned by stats, such as cache hits and misses, as thermometer_<name>_<stat>."""
+        self.collectors[name] = stats
+
+    def phase(self, command: str, phase: str) -> ContextManager[None]:
+        if not self.enabled:
+            return _disabled_phase
+        return _Phase(self, command, phase)
+
+    def observe(self, command: str, phase: str, seconds: float) -> None:
+        if self.enabled:
+            self.latencies[command, phase].observe(seconds)
+
+    def record_error(self, command: str, phase: str) -> None:
+        if self.enabled:
+            self.errors[command, phase] += 1
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] += amount
+
+    def reset(self) -> None:
+        self.latencies.clear()
+        self.errors.clear()
+        self.counters.clear()
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# HELP thermometer_phase_seconds Time spent in each phase of a command.",
+            "# TYPE thermometer_phase_seconds histogram",
+        ]
+        for (command, phase), histogram in sorted(self.latencies.items()):
+            labels = f'command="{command}",phase="{phase}"'
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, "+Inf"), histogram.bucket_counts):
+                cumulative += count
+                lines.append(f'thermometer_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"thermometer_phase_seconds_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"thermometer_phase_seconds_count{{{labels}}} {histogram.count}")
+
+        lines += [
+            "# HELP thermometer_errors_total Errors raised in each phase of a command.",
+            "# TYPE thermometer_errors_total counter",
+        ]
+        for (command, phase), count in sorted(self.errors.items()):
+            lines.append(f'thermometer_errors_total{{command="{command}",phase="{phase}"}} {count}')
+
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE thermometer_{name}_total counter")
+            lines.append(f"thermometer_{name}_total {value}")
+
+        for name, stats in sorted(self.collectors.items()):
+            for stat, value in stats().items():
+                if stat in COUNTER_STATS:
+                    lines.append(f"# TYPE thermometer_{name}_{stat}_total counter")
+                    lines.append(f"thermometer_{name}_{stat}_total {value}")
+                else:
+                    lines.append(f"# TYPE thermometer_{name}_{stat} gauge")
+                    lines.append(f"thermometer_{name}_{stat} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
@@ -0,0 +1,39 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class Offloader:
+    """
+    Runs whole-guild computations in a worker thread once they get large enough to hold up the event loop.
+
+    The computations still hold the GIL, but the interpreter switches threads every few milliseconds,
+    so gateway heartbeats and other commands keep running while a large guild is processed.
+    Callers should pass a snapshot (such as a list copy of guild.members) instead of live cache containers,
+    since the gateway keeps mutating those from the event loop.
+    """
+
+    def __init__(self, threshold: int = 10_000, max_workers: int = 2) -> None:
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def run(self, size: int, func: Callable[..., T], /, *args: Any) -> T:
+        """Calls func directly if size is below the threshold, otherwise in a worker thread."""
+        if size < self.threshold:
+            return func(*args)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="thermometer")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args))
+
+    def shutdown(self) -> None:
+        """Stops the worker threads, so they don't outlive the module. A later run() starts new ones."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+offloader = Offloader()
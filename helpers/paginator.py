@@ -0,0 +1,140 @@
+import math
+from typing import Any, Callable, Sequence
+
+import discord
+from discord.ext import commands
+
+
+class PaginatedView(discord.ui.View):
+    """
+    View that pages through a sequence of entries, only formatting the entries on the page that is currently shown.
+
+    The view keeps the cursor for the message it's attached to, and stops responding once it times out.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[Any],
+        /,
+        *,
+        title: str,
+        header: str = "",
+        formatter: Callable[[Any], str] = str,
+        separator: str = "\n",
+        page_size: int = 50,
+        colour: discord.Colour | None = None,
+        author_id: int | None = None,
+        timeout: float | None = 180,
+    ) -> None:
+        super().__init__(timeout=timeout)
+        self.entries = entries
+        self.title = title
+        self.header = header
+        self.formatter = formatter
+        self.separator = separator
+        self.page_size = page_size
+        self.colour = colour
+        self.author_id = author_id
+        self.page = 0
+        self.message: discord.Message | None = None
+        self.interaction: discord.Interaction | None = None
+        self._update_buttons()
+
+    @property
+    def page_count(self) -> int:
+        return max(1, math.ceil(len(self.entries) / self.page_size))
+
+    def render(self) -> discord.Embed:
+        start = self.page * self.page_size
+        page_entries = self.entries[start:start + self.page_size]
+        embed = discord.Embed(
+            title=self.title,
+            description=self.header + self.separator.join(map(self.formatter, page_entries)),
+            colour=self.colour,
+        )
+        if self.page_count > 1:
+            embed.set_footer(text=f"Page {self.page + 1}/{self.page_count}")
+        return embed
+
+    async def send(self, ctx: commands.Context, **kwargs: Any) -> discord.Message:
+        if self.page_count == 1:
+            self.stop()
+            return await ctx.reply(embed=self.render(), **kwargs)
+        self.message = await ctx.reply(embed=self.render(), view=self, **kwargs)
+        return self.message
+
+    async def send_response(self, interaction: discord.Interaction, **kwargs: Any) -> None:
+        if self.page_count == 1:
+            self.stop()
+            await interaction.response.send_message(embed=self.render(), **kwargs)
+            return
+        self.interaction = interaction
+        await interaction.response.send_message(embed=self.render(), view=self, **kwargs)
+
+    async def interaction_check(self, interaction: discord.Interaction, /) -> bool:
+        if self.author_id is not None and interaction.user.id != self.author_id:
+            await interaction.response.send_message("Only the person who used the command can do that.", ephemeral=True)
+            return False
+        return True
+
+    async def on_timeout(self) -> None:
+        self.previous_page.disabled = True
+        self.next_page.disabled = True
+        try:
+            if self.message:
+                await self.message.edit(view=self)
+            elif self.interaction:
+                await self.interaction.edit_original_response(view=self)
+        except discord.HTTPException:
+            pass
+
+    def _update_buttons(self) -> None:
+        self.previous_page.disabled = self.page <= 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+
+    async def _show_page(self, interaction: discord.Interaction, page: int) -> None:
+        self.page = max(0, min(page, self.page_count - 1))
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.render(), view=self)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        await self._show_page(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
+        await self._show_page(interaction, self.page + 1)
+
+
+class RoleMembersView(PaginatedView):
+    """Pages through the members of several roles, showing one role per page."""
+
+    def __init__(
+        self,
+        role_members: dict[discord.Role, list[discord.Member]],
+        /,
+        *,
+        members_per_page: int = 50,
+        **kwargs: Any,
+    ) -> None:
+        pages = [
+            (role, members, start)
+            for role, members in role_members.items()
+            for start in range(0, len(members), members_per_page)
+        ]
+        self.members_per_page = members_per_page
+        super().__init__(pages, title="", page_size=1, **kwargs)
+
+    def render(self) -> discord.Embed:
+        role, members, start = self.entries[self.page]
+        page_members = members[start:start + self.members_per_page]
+        embed = discord.Embed(
+            title=f'Members with the role "{role.name}"',
+            description=", ".join(member.mention for member in page_members),
+            colour=role.colour,
+        )
+        if len(members) > self.members_per_page:
+            embed.title += f" ({start + 1}-{start + len(page_members)} of {len(members)})"
+        if self.page_count > 1:
+            embed.set_footer(text=f"Page {self.page + 1}/{self.page_count}")
+        return embed
@@ -0,0 +1,186 @@
+from datetime import datetime
+from typing import Any, NamedTuple
+
+import discord
+
+TITLE_LIMIT = 256
+DESCRIPTION_LIMIT = 4096
+FIELD_COUNT_LIMIT = 25
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+# Shared between all embeds of a single message
+MESSAGE_EMBEDS_LIMIT = 6000
+MESSAGE_EMBED_COUNT_LIMIT = 10
+ELLIPSIS = "…"
+
+
+def truncate(string: str, limit: int) -> str:
+    if len(string) <= limit:
+        return string
+    if limit <= len(ELLIPSIS):
+        return ""
+    return string[:limit - len(ELLIPSIS)] + ELLIPSIS
+
+
+class InfoLayout(NamedTuple):
+    """
+    The precomputed shape of an info dict.
+
+    Every key is turned into its bold "**key:** " prefix once, so rendering only has to format the values.
+    """
+    shape: tuple[tuple[str, tuple[str, ...] | None], ...]
+    description: tuple[tuple[str, str], ...]
+    fields: tuple[tuple[str, tuple[tuple[str, str], ...]], ...]
+
+    @classmethod
+    def compile(cls, shape: tuple[tuple[str, tuple[str, ...] | None], ...]) -> "InfoLayout":
+        return cls(
+            shape=shape,
+            description=tuple((key, f"**{key}:** ") for key, sub_keys in shape if sub_keys is None),
+            fields=tuple(
+                (key, tuple((sub_key, f"**{sub_key}:** ") for sub_key in sub_keys))
+                for key, sub_keys in shape
+                if sub_keys is not None
+            ),
+        )
+
+
+_layouts: dict[str, InfoLayout] = {}
+
+
+def get_layout(title: str, info: dict[str, Any], /) -> InfoLayout:
+    shape = tuple(
+        (key, tuple(value) if isinstance(value, dict) else None)
+        for key, value in info.items()
+    )
+    layout = _layouts.get(title)
+    if layout is None or layout.shape != shape:
+        layout = _layouts[title] = InfoLayout.compile(shape)
+    return layout
+
+
+class _Page:
+    __slots__ = ("title", "description", "description_length", "fields")
+
+    def __init__(self, title: str) -> None:
+        self.title = title
+        self.description: list[str] = []
+        self.description_length = 0
+        self.fields: list[tuple[str, str]] = []
+
+
+class _Renderer:
+    def __init__(self, title: str, budget: int, max_embeds: int) -> None:
+        self.title = truncate(title, TITLE_LIMIT)
+        self.continued_title = truncate(f"{title} (continued)", TITLE_LIMIT)
+        self.remaining = budget - len(self.title)
+        self.max_embeds = max_embeds
+        self.pages = [_Page(self.title)]
+        self.full = False
+
+    def _next_page(self) -> _Page | None:
+        if len(self.pages) >= self.max_embeds or self.remaining < len(self.continued_title):
+            self.full = True
+            return None
+        self.remaining -= len(self.continued_title)
+        self.pages.append(_Page(self.continued_title))
+        return self.pages[-1]
+
+    def _fit(self, string: str, limit: int) -> str:
+        """Truncates a string to a limit and the remaining budget, marking the renderer as full if the budget ran out."""
+        if self.remaining < limit:
+            limit = self.remaining
+            if len(string) > limit:
+                self.full = True
+        return truncate(string, limit)
+
+    def add_line(self, line: str) -> None:
+        if self.full:
+            return
+        page: _Page | None = self.pages[-1]
+        if page.description_length + min(len(line), DESCRIPTION_LIMIT) > DESCRIPTION_LIMIT:
+            if (page := self._next_page()) is None:
+                return
+        if not (line := self._fit(line, DESCRIPTION_LIMIT)):
+            return
+        page.description.append(line)
+        page.description_length += len(line)
+        self.remaining -= len(line)
+
+    def add_field(self, name: str, value: str) -> None:
+        if self.full:
+            return
+        page: _Page | None = self.pages[-1]
+        if len(page.fields) >= FIELD_COUNT_LIMIT and (page := self._next_page()) is None:
+            return
+        name = truncate(name, FIELD_NAME_LIMIT)
+        self.remaining -= len(name)
+        if not (value := self._fit(value, FIELD_VALUE_LIMIT)):
+            self.remaining += len(name)
+            return
+        page.fields.append((name, value))
+        self.remaining -= len(value)
+
+
+def chunk_lines(lines: list[str], limit: int) -> list[str]:
+    """Joins lines into as few chunks of at most limit characters as possible, without splitting lines."""
+    chunks: list[str] = []
+    current: list[str] = []
+    current_length = 0
+    for line in lines:
+        line = truncate(line, limit)
+        if current and current_length + len(line) > limit:
+            chunks.append("".join(current))
+            current, current_length = [], 0
+        current.append(line)
+        current_length += len(line)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def build_info_embeds(
+    info: dict[str, Any | None],
+    /,
+    *,
+    title: str,
+    colour: discord.Colour | discord.Color | None = None,
+    thumbnail: str | None = None,
+    image: str | None = None,
+    inline_fields: bool = True,
+    budget: int = MESSAGE_EMBEDS_LIMIT,
+    max_embeds: int = MESSAGE_EMBED_COUNT_LIMIT,
+) -> list[discord.Embed]:
+    """
+    Lays out an info dict in a single pass, keeping to Discord's embed limits.
+
+    Plain values go into the description and dict values become fields. Content that doesn't fit into one embed
+    continues in extra embeds, and whatever doesn't fit into the budget at all is truncated.
+
+    :param budget: Amount of characters the embeds may use, lower it to leave room for other embeds in the message.
+    :param max_embeds: Maximum amount of embeds to return.
+    :return: The embeds, the first of which has the thumbnail, image and timestamp set.
+    """
+    layout = get_layout(title, info)
+    renderer = _Renderer(title, budget, max_embeds)
+
+    for key, prefix in layout.description:
+        if (value := info[key]) is not None:
+            renderer.add_line(f"{prefix}{value}\n")
+
+    for key, sub_prefixes in layout.fields:
+        values: dict[str, Any] = info[key]  # type: ignore[assignment]
+        lines = [f"{prefix}{values[sub_key]}\n" for sub_key, prefix in sub_prefixes if values[sub_key] is not None]
+        for index, chunk in enumerate(chunk_lines(lines, FIELD_VALUE_LIMIT)):
+            renderer.add_field(key if index == 0 else f"{key} (continued)", chunk)
+
+    embeds: list[discord.Embed] = []
+    for page in renderer.pages:
+        embed = discord.Embed(title=page.title, colour=colour, description="".join(page.description) or None)
+        for name, value in page.fields:
+            embed.add_field(name=name, value=value, inline=inline_fields)
+        embeds.append(embed)
+    embeds[0].timestamp = datetime.now()
+    embeds[0].set_thumbnail(url=thumbnail)
+    embeds[0].set_image(url=image)
+    return embeds
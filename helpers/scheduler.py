@@ -0,0 +1,108 @@
+import asyncio
+import itertools
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+QueuedRequest = tuple[int, int, Callable[[], Awaitable[Any]], asyncio.Future[Any]]
+
+# How long a route's worker waits for new follow-ups before shutting down
+WORKER_IDLE_TIMEOUT = 30
+
+
+class SingleFlight:
+    """Shares the result of identical in-flight requests, so a burst of them only hits the API once."""
+
+    def __init__(self) -> None:
+        self.shared = 0
+        self._in_flight: dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def run(self, key: Hashable, request: Callable[[], Awaitable[T]]) -> T:
+        if (future := self._in_flight.get(key)) is None:
+            future = self._in_flight[key] = asyncio.ensure_future(request())
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.shared += 1
+        # Shielded so one caller being cancelled doesn't cancel the request for everyone else
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict[str, int]:
+        return {"in_flight": len(self._in_flight), "shared": self.shared}
+
+
+class RouteScheduler:
+    """
+    Queues non-interactive follow-up requests per route, and holds them back while user-facing requests
+    on the same route are in flight, so the route's rate limit is spent on replies first.
+    """
+
+    def __init__(self) -> None:
+        self._interactive: Counter[Hashable] = Counter()
+        self._idle: dict[Hashable, asyncio.Event] = {}
+        self._queues: dict[Hashable, asyncio.PriorityQueue[QueuedRequest]] = {}
+        self._workers: dict[Hashable, asyncio.Task[None]] = {}
+        self._order = itertools.count()
+
+    @asynccontextmanager
+    async def interactive(self, route: Hashable) -> AsyncIterator[None]:
+        self._interactive[route] += 1
+        self._idle.setdefault(route, asyncio.Event())
+        try:
+            yield
+        finally:
+            self._interactive[route] -= 1
+            if not self._interactive[route]:
+                del self._interactive[route]
+                self._idle.pop(route).set()
+
+    async def follow_up(self, route: Hashable, request: Callable[[], Awaitable[T]], *, priority: int = 0) -> T:
+        """Schedules a request on a route, lower priorities go first. Returns once the request has been made."""
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        if (queue := self._queues.get(route)) is None:
+            queue = self._queues[route] = asyncio.PriorityQueue()
+        queue.put_nowait((priority, next(self._order), request, future))
+        if route not in self._workers:
+            self._workers[route] = asyncio.create_task(self._work(route, queue))
+        return await future
+
+    async def close(self) -> None:
+        """Stops the workers, cancelling the follow-ups that haven't been made yet so nobody waits on them forever."""
+        for worker in self._workers.values():
+            worker.cancel()
+        for queue in self._queues.values():
+            while not queue.empty():
+                *_, future = queue.get_nowait()
+                future.cancel()
+        self._workers.clear()
+        self._queues.clear()
+
+    async def _work(self, route: Hashable, queue: asyncio.PriorityQueue[QueuedRequest]) -> None:
+        while True:
+            try:
+                _, _, request, future = await asyncio.wait_for(queue.get(), timeout=WORKER_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    del self._workers[route]
+                    del self._queues[route]
+                    return
+                continue
+            try:
+                if route in self._idle:
+                    await self._idle[route].wait()
+                if future.done():  # The caller stopped waiting
+                    continue
+                result = await request()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+
+single_flight = SingleFlight()
+route_scheduler = RouteScheduler()
@@ -1,3 +1,4 @@
+import asyncio
 import time
 from datetime import datetime, timezone
 from typing import Any
@@ -6,6 +7,10 @@ import discord
 
 from . import info_to_string, readable_timedelta
 
+SUMMARY_KEYS: tuple[str, ...] = ("Mention", "ID", "User type", "Created at", "Joined at", "Status", "Timed out until")
+# Gateway member queries accept at most 100 user IDs
+QUERY_BATCH_SIZE = 100
+
 
 class WhoisHelper:
     @staticmethod
@@ -52,6 +57,47 @@ class WhoisHelper:
             "Roles": ", ".join(role.mention for role in reversed(member.roles) if role.name != "@everyone") or None,
         }
 
+    @staticmethod
+    async def get_member_summary(member: discord.Member, /) -> str:
+        details = await WhoisHelper.get_user_details(member) | await WhoisHelper.get_member_details(member)
+        summary = {key: details[key] for key in SUMMARY_KEYS}
+        summary["Role count"] = len(member.roles) - 1  # Not counting @everyone
+        return f"### {details['Username']}\n" + info_to_string(summary)
+
+    @staticmethod
+    async def resolve_members(
+        guild: discord.Guild,
+        user_ids: list[int],
+        /,
+    ) -> tuple[list[discord.Member], list[int]]:
+        """
+        Resolves members from the cache, querying the gateway in batches for the ones that aren't cached.
+
+        :return: The resolved members, and the IDs that couldn't be resolved.
+        """
+        members: list[discord.Member] = []
+        missing: list[int] = []
+        for user_id in user_ids:
+            if member := guild.get_member(user_id):
+                members.append(member)
+            else:
+                missing.append(user_id)
+        unresolved: list[int] = []
+        for start in range(0, len(missing), QUERY_BATCH_SIZE):
+            batch = missing[start:start + QUERY_BATCH_SIZE]
+            try:
+                found = await guild.query_members(user_ids=batch, limit=QUERY_BATCH_SIZE)
+            except discord.ClientException:  # The members intent is disabled, so none of the batches can succeed
+                unresolved += missing[start:]
+                break
+            except asyncio.TimeoutError:
+                unresolved += batch
+                continue
+            members.extend(found)
+            found_ids = {member.id for member in found}
+            unresolved += [user_id for user_id in batch if user_id not in found_ids]
+        return members, unresolved
+
     @staticmethod
     async def create_spotify_embed(activity: discord.Spotify) -> discord.Embed:
         return discord.Embed(